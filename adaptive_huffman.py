@@ -0,0 +1,313 @@
+"""Calculate adaptive Huffman code (FGK algorithm) in one pass"""
+
+from huffman import get_symbol_index, get_symbol, flush_bit_buffer
+
+
+# Bits for symbol that occurs first time: code point for characters
+CHARACTER_BITS = 21
+BYTE_BITS = 8
+
+NO_NODE = -1
+
+
+class AdaptiveHuffmanTree:
+    """Huffman tree that is updated after every symbol
+
+    Nodes are kept in lists by their ids. Positions order nodes from root
+    to NYT (node for symbols that haven't occurred yet), weights don't grow
+    along positions (sibling property). Leader of weight is the first
+    position with this weight, so update costs O(code length).
+    """
+
+    __slots__ = (
+        'weights', 'parents', 'lefts', 'rights', 'symbols', 'positions',
+        'nodes_by_position', 'leaders', 'leaves', 'nyt'
+    )
+
+    def __init__(self):
+        self.weights = [0]
+        self.parents = [NO_NODE]
+        self.lefts = [NO_NODE]
+        self.rights = [NO_NODE]
+        self.symbols = [None]
+        self.positions = [0]
+        self.nodes_by_position = [0]
+        self.leaders = {0: 0}
+        self.leaves = {}
+        self.nyt = 0
+
+    def get_code(self, node):
+        """Get value and length of code for node"""
+
+        parents, rights = self.parents, self.rights
+        code_value = 0
+        code_length = 0
+        parent = parents[node]
+
+        while parent != NO_NODE:
+            if rights[parent] == node:
+                code_value |= 1 << code_length
+
+            code_length += 1
+            node = parent
+            parent = parents[node]
+
+        return code_value, code_length
+
+    def update(self, symbol):
+        """Update tree after symbol"""
+
+        node = self.leaves.get(symbol)
+
+        if node is None:
+            node = self.add_symbol(symbol)
+
+        weights, parents = self.weights, self.parents
+        nodes_by_position, leaders = self.nodes_by_position, self.leaders
+
+        while node != NO_NODE:
+            leader = nodes_by_position[leaders[weights[node]]]
+
+            if leader != node and leader != parents[node]:
+                self.swap_nodes(node, leader)
+
+            self.increment_weight(node)
+            node = parents[node]
+
+    def add_symbol(self, symbol):
+        """Add leaf for symbol to NYT and get node to update from"""
+
+        old_nyt = self.nyt
+        old_nyt_position = self.positions[old_nyt]
+        leaf = self.add_node(old_nyt, symbol)
+        self.nyt = self.add_node(old_nyt, None)
+
+        self.lefts[old_nyt], self.rights[old_nyt] = self.nyt, leaf
+        self.leaves[symbol] = leaf
+
+        # Old NYT and new leaf get weight 1 at once and are the last
+        # nodes with this weight
+        self.weights[old_nyt] = self.weights[leaf] = 1
+        self.leaders[0] = self.positions[self.nyt]
+        self.leaders.setdefault(1, old_nyt_position)
+
+        return self.parents[old_nyt]
+
+    def add_node(self, parent, symbol):
+        """Add node with weight 0 to the last position"""
+
+        node = len(self.weights)
+
+        self.weights.append(0)
+        self.parents.append(parent)
+        self.lefts.append(NO_NODE)
+        self.rights.append(NO_NODE)
+        self.symbols.append(symbol)
+        self.positions.append(len(self.nodes_by_position))
+        self.nodes_by_position.append(node)
+
+        return node
+
+    def swap_nodes(self, first_node, second_node):
+        """Swap nodes with their subtrees and positions"""
+
+        parents, lefts, rights = self.parents, self.lefts, self.rights
+        positions = self.positions
+        first_parent, second_parent = parents[first_node], parents[second_node]
+
+        if first_parent == second_parent:
+            lefts[first_parent], rights[first_parent] = \
+                rights[first_parent], lefts[first_parent]
+        else:
+            for parent, old_child, new_child in (
+                    (first_parent, first_node, second_node),
+                    (second_parent, second_node, first_node)):
+                if lefts[parent] == old_child:
+                    lefts[parent] = new_child
+                else:
+                    rights[parent] = new_child
+
+        parents[first_node], parents[second_node] = second_parent, first_parent
+
+        first_position, second_position = \
+            positions[first_node], positions[second_node]
+        positions[first_node], positions[second_node] = \
+            second_position, first_position
+        self.nodes_by_position[first_position] = second_node
+        self.nodes_by_position[second_position] = first_node
+
+    def increment_weight(self, node):
+        """Increment weight of node and update leaders of weights"""
+
+        weights, leaders = self.weights, self.leaders
+        weight = weights[node]
+        position = self.positions[node]
+
+        if leaders[weight] == position:
+            next_position = position + 1
+
+            if next_position < len(self.nodes_by_position) and weights[
+                    self.nodes_by_position[next_position]] == weight:
+                leaders[weight] = next_position
+            else:
+                del leaders[weight]
+
+        weights[node] = weight + 1
+
+        if leaders.get(weight + 1, position + 1) > position:
+            leaders[weight + 1] = position
+
+
+class AdaptiveHuffmanEncoder:
+    """Encoder of adaptive Huffman code without header
+
+    Symbol that occurs first time is coded as NYT code and symbol bits.
+    """
+
+    __slots__ = ('tree', 'symbol_bits', 'bit_buffer', 'bit_length')
+
+    def __init__(self, are_characters=True):
+        self.tree = AdaptiveHuffmanTree()
+        self.symbol_bits = CHARACTER_BITS if are_characters else BYTE_BITS
+        self.bit_buffer = [0, 0]
+        self.bit_length = 0
+
+    def encode(self, symbols):
+        """Get packed code for symbols that fills whole bytes
+
+        Rest of bits stays in bit buffer until the next symbols or flush.
+        """
+
+        tree = self.tree
+        buffer_value, buffer_length = self.bit_buffer
+        packed_code = bytearray()
+
+        for symbol in symbols:
+            leaf = tree.leaves.get(symbol)
+
+            if leaf is None:
+                code_value, code_length = tree.get_code(tree.nyt)
+                code_value = (code_value << self.symbol_bits) | \
+                    get_symbol_index(symbol)
+                code_length += self.symbol_bits
+            else:
+                code_value, code_length = tree.get_code(leaf)
+
+            tree.update(symbol)
+
+            buffer_value = (buffer_value << code_length) | code_value
+            buffer_length += code_length
+            self.bit_length += code_length
+
+            if buffer_length >= 8:
+                rest_length = buffer_length & 7
+                packed_code += (buffer_value >> rest_length).to_bytes(
+                    buffer_length >> 3, 'big'
+                )
+                buffer_value &= (1 << rest_length) - 1
+                buffer_length = rest_length
+
+        self.bit_buffer[0], self.bit_buffer[1] = buffer_value, buffer_length
+
+        return bytes(packed_code)
+
+    def flush(self):
+        """Get last byte of code padded with zero bits"""
+
+        packed_code = bytearray()
+        flush_bit_buffer(self.bit_buffer, packed_code)
+
+        return bytes(packed_code)
+
+
+class AdaptiveHuffmanDecoder:
+    """Decoder of adaptive Huffman code from AdaptiveHuffmanEncoder"""
+
+    __slots__ = (
+        'tree', 'are_characters', 'symbol_bits', 'node', 'symbol_value',
+        'symbol_bits_left', 'bit_length'
+    )
+
+    def __init__(self, are_characters=True):
+        self.tree = AdaptiveHuffmanTree()
+        self.are_characters = are_characters
+        self.symbol_bits = CHARACTER_BITS if are_characters else BYTE_BITS
+        self.node = 0
+        self.symbol_value = 0
+        # The first symbol is coded by its bits only
+        self.symbol_bits_left = self.symbol_bits
+        self.bit_length = 0
+
+    def decode(self, packed_code, bit_length=None):
+        """Get symbols decoded from the next part of packed code
+
+        Symbol can be split between parts of packed code. Bits after
+        bit_length (length of the whole code) are padding.
+        """
+
+        tree = self.tree
+        lefts, rights = tree.lefts, tree.rights
+        symbols = []
+        bits_left = len(packed_code) * 8 if bit_length is None \
+            else bit_length - self.bit_length
+
+        for byte in packed_code:
+            for shift in range(7, -1, -1):
+                if bits_left == 0:
+                    return self.get_decoded_message(symbols)
+
+                bits_left -= 1
+                self.bit_length += 1
+                bit = (byte >> shift) & 1
+
+                if self.symbol_bits_left > 0:
+                    self.symbol_value = (self.symbol_value << 1) | bit
+                    self.symbol_bits_left -= 1
+
+                    if self.symbol_bits_left == 0:
+                        self.add_symbol(
+                            get_symbol(self.symbol_value, self.are_characters),
+                            symbols
+                        )
+                        self.symbol_value = 0
+
+                    continue
+
+                self.node = rights[self.node] if bit else lefts[self.node]
+
+                if self.node == tree.nyt:
+                    self.symbol_bits_left = self.symbol_bits
+                elif lefts[self.node] == NO_NODE:
+                    self.add_symbol(tree.symbols[self.node], symbols)
+
+        return self.get_decoded_message(symbols)
+
+    def add_symbol(self, symbol, symbols):
+        """Add decoded symbol and update tree"""
+
+        symbols.append(symbol)
+        self.tree.update(symbol)
+        self.node = 0
+
+    def get_decoded_message(self, symbols):
+        """Get string or bytes from decoded symbols"""
+
+        return ''.join(symbols) if self.are_characters else bytes(symbols)
+
+
+def get_adaptive_huffman_code(message):
+    """Get packed adaptive Huffman code for message and its length in bits"""
+
+    encoder = AdaptiveHuffmanEncoder(isinstance(message, str))
+    packed_code = encoder.encode(message) + encoder.flush()
+
+    return packed_code, encoder.bit_length
+
+
+def get_message_from_adaptive_huffman_code(
+        packed_code, bit_length, are_characters=True):
+    """Get message from packed adaptive Huffman code"""
+
+    return AdaptiveHuffmanDecoder(are_characters).decode(
+        packed_code, bit_length
+    )
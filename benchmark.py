@@ -0,0 +1,250 @@
+"""Benchmark stages of Huffman code on reproducible synthetic corpora
+
+Results are saved as JSON. If baseline results are given, benchmark fails
+when a stage is slower than its baseline time multiplied by threshold.
+"""
+
+from argparse import ArgumentParser
+from json import dump, load
+from random import Random
+from sys import exit as exit_with_code
+from time import perf_counter
+
+from huffman import (
+    get_symbols_with_frequency, get_sorted_symbols_with_frequency,
+    get_huffman_code_tree, get_symbols_with_code, get_packed_huffman_code,
+    get_decoding_tables, get_message_from_packed_huffman_code
+)
+
+
+BENCHMARK_SEED = 2024
+CORPUS_SIZES = (1 << 10, 1 << 14, 1 << 18)
+BENCHMARK_REPEATS = 3
+REGRESSION_THRESHOLD = 1.5
+
+# Stages that are faster in baseline are too noisy to compare
+MIN_COMPARED_STAGE_TIME = 1e-3
+
+PRINTABLE_CHARACTERS = ''.join(map(chr, range(32, 127)))
+LARGE_ALPHABET_CHARACTERS = ''.join(map(chr, range(0x4E00, 0x5E00)))
+ENGLISH_WORDS = (
+    'the', 'of', 'and', 'to', 'a', 'in', 'is', 'it', 'you', 'that', 'he',
+    'was', 'for', 'on', 'are', 'with', 'as', 'his', 'they', 'be', 'at',
+    'one', 'have', 'this', 'from', 'or', 'had', 'by', 'word', 'but', 'what',
+    'some', 'we', 'can', 'out', 'other', 'were', 'all', 'there', 'when',
+    'up', 'use', 'your', 'how', 'said', 'an', 'each', 'she', 'which', 'do',
+    'their', 'time', 'if', 'will', 'way', 'about', 'many', 'then', 'them',
+    'write', 'would', 'like', 'so', 'these', 'her', 'long', 'make', 'thing',
+    'see', 'him', 'two', 'has', 'look', 'more', 'day', 'could', 'go', 'come',
+    'did', 'number', 'sound', 'no', 'most', 'people', 'my', 'over', 'know',
+    'water', 'than', 'call', 'first', 'who', 'may', 'down', 'side', 'been',
+    'now', 'find', 'Huffman', 'code', 'message', 'systems', 'programming'
+)
+
+
+def get_uniform_corpus(size, random):
+    """Get corpus with printable characters of the same probability"""
+
+    return ''.join(random.choices(PRINTABLE_CHARACTERS, k=size))
+
+
+def get_zipfian_corpus(size, random):
+    """Get corpus with printable characters with probability 1 / rank"""
+
+    return ''.join(random.choices(
+        PRINTABLE_CHARACTERS,
+        [1 / rank for rank in range(1, len(PRINTABLE_CHARACTERS) + 1)],
+        k=size
+    ))
+
+
+def get_skewed_corpus(size, random):
+    """Get corpus where one character has probability about 0.95"""
+
+    return ''.join(random.choices(
+        PRINTABLE_CHARACTERS,
+        [0.95] + [0.05 / (len(PRINTABLE_CHARACTERS) - 1)]
+        * (len(PRINTABLE_CHARACTERS) - 1),
+        k=size
+    ))
+
+
+def get_large_alphabet_corpus(size, random):
+    """Get corpus with 4096 CJK characters of the same probability"""
+
+    return ''.join(random.choices(LARGE_ALPHABET_CHARACTERS, k=size))
+
+
+def get_english_corpus(size, random):
+    """Get corpus of English words with probability 1 / rank"""
+
+    weights = [1 / rank for rank in range(1, len(ENGLISH_WORDS) + 1)]
+    corpus = ''
+
+    while len(corpus) < size:
+        corpus += ' '.join(
+            random.choices(ENGLISH_WORDS, weights, k=size // 4 + 1)
+        ) + ' '
+
+    return corpus[:size]
+
+
+CORPUS_GENERATORS = {
+    'uniform': get_uniform_corpus,
+    'zipfian': get_zipfian_corpus,
+    'skewed': get_skewed_corpus,
+    'large_alphabet': get_large_alphabet_corpus,
+    'english': get_english_corpus,
+}
+
+
+def get_corpus(corpus_name, size):
+    """Get the same corpus for the same name and size"""
+
+    return CORPUS_GENERATORS[corpus_name](
+        size, Random(f'{BENCHMARK_SEED}:{corpus_name}:{size}')
+    )
+
+
+def get_best_time(function, repeats, *arguments):
+    """Get result of function and the best time of its repeats in seconds"""
+
+    best_time = float('inf')
+
+    for _ in range(repeats):
+        start_time = perf_counter()
+        result = function(*arguments)
+        best_time = min(best_time, perf_counter() - start_time)
+
+    return result, best_time
+
+
+def get_stage_times(message, repeats=BENCHMARK_REPEATS):
+    """Get time of every stage of Huffman code for message"""
+
+    stage_times = {}
+
+    symbols_with_frequency, stage_times['frequency'] = get_best_time(
+        get_symbols_with_frequency, repeats, message
+    )
+    code_tree, stage_times['tree'] = get_best_time(
+        get_huffman_code_tree, repeats,
+        get_sorted_symbols_with_frequency(symbols_with_frequency, False)
+    )
+    symbols_with_code, stage_times['code'] = get_best_time(
+        lambda: get_symbols_with_code(*code_tree, {}), repeats
+    )
+    (packed_code, bit_length), stage_times['encode'] = get_best_time(
+        get_packed_huffman_code, repeats, symbols_with_code, message
+    )
+    decoded_message, stage_times['decode'] = get_best_time(
+        lambda: get_message_from_packed_huffman_code(
+            get_decoding_tables(symbols_with_code), packed_code, bit_length
+        ),
+        repeats
+    )
+
+    if decoded_message != message:
+        raise ValueError('Decoded message differs from the initial one')
+
+    return stage_times
+
+
+def get_benchmark_results(
+        corpus_sizes=CORPUS_SIZES, repeats=BENCHMARK_REPEATS):
+    """Get stage times for every corpus and size
+
+    Results are {'corpus/size': {stage: seconds}}.
+    """
+
+    return {
+        f'{corpus_name}/{size}': get_stage_times(
+            get_corpus(corpus_name, size), repeats
+        )
+        for corpus_name in CORPUS_GENERATORS
+        for size in corpus_sizes
+    }
+
+
+def get_regressions(
+        results, baseline_results, threshold=REGRESSION_THRESHOLD):
+    """Get (case, stage, baseline time, time) for stages that slowed down
+
+    Cases and stages that aren't in both results are skipped.
+    """
+
+    regressions = []
+
+    for case, stage_times in results.items():
+        for stage, stage_time in stage_times.items():
+            baseline_time = baseline_results.get(case, {}).get(stage)
+
+            if baseline_time is None or \
+                    baseline_time < MIN_COMPARED_STAGE_TIME:
+                continue
+
+            if stage_time > baseline_time * threshold:
+                regressions.append((case, stage, baseline_time, stage_time))
+
+    return regressions
+
+
+def get_argument_parser():
+    argument_parser = ArgumentParser(
+        description='Benchmark stages of Huffman code on synthetic corpora.'
+    )
+    argument_parser.add_argument(
+        '--output', default='benchmark.json',
+        help='JSON file for results (default: %(default)s)'
+    )
+    argument_parser.add_argument(
+        '--baseline', help='JSON file with baseline results to compare'
+    )
+    argument_parser.add_argument(
+        '--threshold', type=float, default=REGRESSION_THRESHOLD,
+        help='allowed ratio of time to baseline time (default: %(default)s)'
+    )
+    argument_parser.add_argument(
+        '--sizes', type=int, nargs='+', default=CORPUS_SIZES,
+        help='corpus sizes in symbols'
+    )
+    argument_parser.add_argument(
+        '--repeats', type=int, default=BENCHMARK_REPEATS,
+        help='repeats of every stage, the best time is taken'
+    )
+
+    return argument_parser
+
+
+def main(arguments=None):
+    arguments = get_argument_parser().parse_args(arguments)
+    results = get_benchmark_results(arguments.sizes, arguments.repeats)
+
+    with open(arguments.output, 'w') as output_file:
+        dump(results, output_file, indent=4)
+
+    for case, stage_times in results.items():
+        print(case, *(
+            f'{stage}: {stage_time * 1000:.3f} ms'
+            for stage, stage_time in stage_times.items()
+        ), sep='\t')
+
+    if arguments.baseline is None:
+        return 0
+
+    with open(arguments.baseline) as baseline_file:
+        regressions = get_regressions(
+            results, load(baseline_file), arguments.threshold
+        )
+
+    for case, stage, baseline_time, stage_time in regressions:
+        print(
+            f'Regression: {case} {stage} {stage_time * 1000:.3f} ms, '
+            f'baseline {baseline_time * 1000:.3f} ms'
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    exit_with_code(main())
@@ -3,14 +3,26 @@
 from collections import defaultdict
 from random import randint
 from re import findall
+from struct import iter_unpack
 
 
 from colorama import Fore
 
+try:
+    from crc_tables import CRC_TABLES
+except ImportError:
+    CRC_TABLES = {}
+
+# Tables for get_crc_for_bytes_by_slicing by binary code and slices amount
+CRC_SLICING_TABLES = {}
+
 
 HEX_MESSAGE = 'A4678FE1'
 POLYNOMIAL = 'x ^ 10 + x ^ 9 + x ^ 5 + x ^ 4 + x + 1'
 
+# Bytes that are divided at once by get_crc_for_bytes_by_slicing, 8 or 16
+SLICES_AMOUNT = 8
+
 
 def get_binary_code_from_hex_code(hex_code):
     """Get binary code from hex code"""
@@ -124,33 +136,303 @@ def get_quotient_of_two_binary_codes(first_binary_code, second_binary_code):
 
 
 def get_crc_code(divisible, divisor):
-    """Get CRC code"""
+    """Get CRC code
+
+    Remainder is kept in integer, so dividing costs O(n) instead of copying
+    strings for every bit. Result is the same as from division of strings
+    with get_quotient_of_two_binary_codes: remainder is XORed with divisor
+    when it gets length of divisor, and bits that are left after the last
+    XOR are returned as they are.
+    """
 
     divisor_length = len(divisor)
+    divisor_value = int(divisor, 2)
+    divisible_length = len(divisible)
+
+    quotient = int(divisible[:divisor_length], 2) ^ divisor_value
+    quotient_length = quotient.bit_length()
+    position = divisor_length
+
+    while position < divisible_length:
+        if quotient_length != divisor_length:
+            pulled_bits_amount = min(
+                divisor_length - quotient_length, divisible_length - position
+            )
+            quotient = (quotient << pulled_bits_amount) | int(
+                divisible[position:position + pulled_bits_amount], 2
+            )
+            quotient_length += pulled_bits_amount
+            position += pulled_bits_amount
+
+        if position == divisible_length:
+            break
+
+        quotient ^= divisor_value
+        quotient_length = quotient.bit_length()
+
+    if quotient_length == 0:
+        return ''
+
+    return format(quotient, f'0{quotient_length}b')
+
+
+def get_crc_for_bytes(data, binary_code_for_polynomial, bit_length=None):
+    """Get CRC code for bytes as integer
 
-    divisible_initial_part = divisible[:divisor_length]
-    divisible = divisible[divisor_length:]
+    Bytes are divided by one lookup in table of polynomial for every byte
+    (Sarwate algorithm). If bit_length isn't multiple of 8, bits of the last
+    byte are divided one by one from the most significant bit. Message is
+    supplemented with zero bits like in get_full_binary_message.
+    """
 
-    quotient = get_quotient_of_two_binary_codes(
-        divisible_initial_part, divisor
+    degree_of_polynomial = len(binary_code_for_polynomial) - 1
+
+    if bit_length is None:
+        bit_length = len(data) * 8
+
+    remainder = get_crc_register_for_bytes(
+        0, data, bit_length, binary_code_for_polynomial
     )
 
-    while len(divisible) != 0:
-        if len(quotient) != divisor_length:
-            diff = divisor_length - len(quotient)
-            for _ in range(diff):
-                if len(divisible) == 0:
-                    break
-                quotient = quotient + divisible[0]
-                divisible = divisible[1:]
-        if len(divisible) == 0:
-            break
+    return remainder >> (max(degree_of_polynomial, 8) - degree_of_polynomial)
+
+
+def get_crc_for_bytes_by_slicing(
+        data, binary_code_for_polynomial, bit_length=None,
+        slices_amount=SLICES_AMOUNT):
+    """Get CRC code for bytes as integer by 8 or 16 bytes at once
+
+    Register is XORed into the highest bytes of block and every byte of
+    block is divided by its own table (slicing-by-8 or slicing-by-16), so
+    there is one loop iteration instead of 8 or 16. Result is the same as
+    from get_crc_for_bytes, polynomials of degree larger than block are
+    divided by get_crc_for_bytes.
+    """
+
+    degree_of_polynomial = len(binary_code_for_polynomial) - 1
+    register_length = max(degree_of_polynomial, 8)
+
+    if register_length > slices_amount * 8:
+        return get_crc_for_bytes(data, binary_code_for_polynomial, bit_length)
+
+    if bit_length is None:
+        bit_length = len(data) * 8
+
+    blocks_length = (bit_length >> 3) - (bit_length >> 3) % slices_amount
+    get_crc_register_for_blocks = {
+        8: get_crc_register_for_8_byte_blocks,
+        16: get_crc_register_for_16_byte_blocks,
+    }[slices_amount]
 
-        quotient = get_quotient_of_two_binary_codes(
-            quotient, divisor
+    with memoryview(data) as data_view:
+        remainder = get_crc_register_for_blocks(
+            0, data_view[:blocks_length], binary_code_for_polynomial
+        )
+        remainder = get_crc_register_for_bytes(
+            remainder, data_view[blocks_length:],
+            bit_length - blocks_length * 8, binary_code_for_polynomial
         )
 
-    return quotient
+    return remainder >> (register_length - degree_of_polynomial)
+
+
+def get_crc_register_for_bytes(
+        remainder, data, bit_length, binary_code_for_polynomial):
+    """Get CRC register after dividing bit_length bits of bytes"""
+
+    crc_table = get_crc_table(binary_code_for_polynomial)
+    register_length = max(len(binary_code_for_polynomial) - 1, 8)
+    register_mask = (1 << register_length) - 1
+    byte_shift = register_length - 8
+
+    for byte in data[:bit_length >> 3]:
+        remainder = ((remainder << 8) & register_mask) ^ crc_table[
+            (remainder >> byte_shift) ^ byte
+        ]
+
+    if bit_length & 7:
+        remainder = get_crc_register_for_bits(
+            remainder, data[bit_length >> 3], bit_length & 7,
+            binary_code_for_polynomial
+        )
+
+    return remainder
+
+
+def get_crc_register_for_8_byte_blocks(
+        remainder, data, binary_code_for_polynomial):
+    """Get CRC register after dividing bytes by blocks of 8 bytes"""
+
+    (table_7, table_6, table_5, table_4,
+     table_3, table_2, table_1, table_0) = get_crc_slicing_tables(
+        binary_code_for_polynomial, 8
+    )[::-1]
+    block_shift = 64 - max(len(binary_code_for_polynomial) - 1, 8)
+
+    for (block,) in iter_unpack('>Q', data):
+        byte_0, byte_1, byte_2, byte_3, byte_4, byte_5, byte_6, byte_7 = \
+            (block ^ (remainder << block_shift)).to_bytes(8, 'big')
+        remainder = \
+            table_7[byte_0] ^ table_6[byte_1] ^ table_5[byte_2] ^ \
+            table_4[byte_3] ^ table_3[byte_4] ^ table_2[byte_5] ^ \
+            table_1[byte_6] ^ table_0[byte_7]
+
+    return remainder
+
+
+def get_crc_register_for_16_byte_blocks(
+        remainder, data, binary_code_for_polynomial):
+    """Get CRC register after dividing bytes by blocks of 16 bytes"""
+
+    (table_15, table_14, table_13, table_12,
+     table_11, table_10, table_9, table_8,
+     table_7, table_6, table_5, table_4,
+     table_3, table_2, table_1, table_0) = get_crc_slicing_tables(
+        binary_code_for_polynomial, 16
+    )[::-1]
+    block_shift = 128 - max(len(binary_code_for_polynomial) - 1, 8)
+
+    for high_block, low_block in iter_unpack('>QQ', data):
+        (byte_0, byte_1, byte_2, byte_3, byte_4, byte_5, byte_6, byte_7,
+         byte_8, byte_9, byte_10, byte_11,
+         byte_12, byte_13, byte_14, byte_15) = (
+            ((high_block << 64) | low_block) ^ (remainder << block_shift)
+        ).to_bytes(16, 'big')
+        remainder = \
+            table_15[byte_0] ^ table_14[byte_1] ^ table_13[byte_2] ^ \
+            table_12[byte_3] ^ table_11[byte_4] ^ table_10[byte_5] ^ \
+            table_9[byte_6] ^ table_8[byte_7] ^ table_7[byte_8] ^ \
+            table_6[byte_9] ^ table_5[byte_10] ^ table_4[byte_11] ^ \
+            table_3[byte_12] ^ table_2[byte_13] ^ table_1[byte_14] ^ \
+            table_0[byte_15]
+
+    return remainder
+
+
+def get_crc_register_for_bits(
+        remainder, byte, bits_amount, binary_code_for_polynomial):
+    """Get CRC register after dividing the highest bits of byte one by one"""
+
+    degree_of_polynomial = len(binary_code_for_polynomial) - 1
+    register_length = max(degree_of_polynomial, 8)
+    register_mask = (1 << register_length) - 1
+    polynomial = get_register_polynomial(binary_code_for_polynomial)
+
+    for shift in range(7, 7 - bits_amount, -1):
+        highest_bit = (remainder >> (register_length - 1)) ^ (byte >> shift)
+        remainder = (remainder << 1) & register_mask
+
+        if highest_bit & 1:
+            remainder ^= polynomial
+
+    return remainder
+
+
+def get_register_polynomial(binary_code_for_polynomial):
+    """Get polynomial without the highest bit aligned to CRC register
+
+    Register has at least 8 bits, so polynomials of smaller degree are
+    shifted to its highest bits.
+    """
+
+    degree_of_polynomial = len(binary_code_for_polynomial) - 1
+    polynomial = int(binary_code_for_polynomial, 2) & \
+        ((1 << degree_of_polynomial) - 1)
+
+    return polynomial << (max(degree_of_polynomial, 8) - degree_of_polynomial)
+
+
+def get_crc_table(binary_code_for_polynomial):
+    """Get table with CRC register for every byte at the register start
+
+    Tables are cached by binary code for polynomial and can be precomputed
+    to crc_tables module by write_crc_tables_module.
+    """
+
+    crc_table = CRC_TABLES.get(binary_code_for_polynomial)
+
+    if crc_table is not None:
+        return crc_table
+
+    degree_of_polynomial = len(binary_code_for_polynomial) - 1
+    register_length = max(degree_of_polynomial, 8)
+    crc_table = tuple(
+        get_crc_register_for_bits(
+            byte << (register_length - 8), 0, 8, binary_code_for_polynomial
+        )
+        for byte in range(256)
+    )
+    CRC_TABLES[binary_code_for_polynomial] = crc_table
+
+    return crc_table
+
+
+def get_crc_slicing_tables(binary_code_for_polynomial, slices_amount):
+    """Get tables for dividing byte followed by 0 ... slices_amount - 1 bytes
+
+    Table k has CRC register for byte with k zero bytes after it, so it's
+    table of polynomial for k = 0 and is derived from table k - 1 by
+    division of one zero byte.
+    """
+
+    slicing_tables = CRC_SLICING_TABLES.get(
+        (binary_code_for_polynomial, slices_amount)
+    )
+
+    if slicing_tables is not None:
+        return slicing_tables
+
+    crc_table = get_crc_table(binary_code_for_polynomial)
+    register_length = max(len(binary_code_for_polynomial) - 1, 8)
+    register_mask = (1 << register_length) - 1
+    byte_shift = register_length - 8
+    slicing_tables = [crc_table]
+
+    for _ in range(slices_amount - 1):
+        slicing_tables.append(tuple(
+            ((remainder << 8) & register_mask) ^
+            crc_table[remainder >> byte_shift]
+            for remainder in slicing_tables[-1]
+        ))
+
+    slicing_tables = tuple(slicing_tables)
+    CRC_SLICING_TABLES[binary_code_for_polynomial, slices_amount] = \
+        slicing_tables
+
+    return slicing_tables
+
+
+def write_crc_tables_module(file_path, polynomials):
+    """Write module with precomputed CRC tables for polynomials
+
+    Module is imported by crc as crc_tables if it's on the import path.
+    """
+
+    with open(file_path, 'w') as module_file:
+        module_file.write('"""Precomputed CRC tables"""\n\nCRC_TABLES = {\n')
+
+        for polynomial in polynomials:
+            binary_code_for_polynomial = get_binary_code_for_polynomial(
+                polynomial
+            )
+            module_file.write(
+                f'    {binary_code_for_polynomial!r}: '
+                f'{get_crc_table(binary_code_for_polynomial)!r},\n'
+            )
+
+        module_file.write('}\n')
+
+
+def get_crc_for_binary_message(binary_message, binary_code_for_polynomial):
+    """Get CRC code for binary message as integer"""
+
+    bit_length = len(binary_message)
+    padding_length = -bit_length & 7
+    data = int(binary_message + '0' * padding_length, 2).to_bytes(
+        (bit_length + padding_length) >> 3, 'big'
+    )
+
+    return get_crc_for_bytes(data, binary_code_for_polynomial, bit_length)
 
 
 def get_full_binary_message(incomplete_binary_message, degree_of_polynomial):
@@ -169,8 +451,9 @@ def is_binary_message_with_crc_correct(
 
     print(f'\nCheck for message {binary_message_with_crc}')
 
+    # Message can have colored mistake
     crc_code = get_crc_code(
-        binary_message_with_crc,
+        binary_message_with_crc.replace(Fore.RED, '').replace(Fore.WHITE, ''),
         binary_code_for_polynomial
     )
 
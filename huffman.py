@@ -1,23 +1,263 @@
 """Calculate Huffman code"""
 
+from array import array
 from bisect import bisect_left
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from heapq import heapify, heappop, heappush
 from math import log2
+from mmap import mmap, ACCESS_READ
+from multiprocessing.shared_memory import SharedMemory
+from os.path import getsize
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 MESSAGE = "Communication systems with over-the-air-programming"
 
+# Bit buffer of packed code is flushed to bytes when it gets this long
+BIT_BUFFER_FLUSH_LENGTH = 256
+
+# Amount of bits that are decoded by one lookup in decoding table
+DECODING_LOOKUP_BITS = 10
+
+# Amount of bytes that are added to bit buffer at once while decoding
+DECODING_REFILL_BYTES = 32
+
+# Serialized code lengths are bytes with code length or with one of
+# the repeat marks that are followed by varint with amount of repeats - 3
+MAX_SERIALIZED_CODE_LENGTH = 0xFD
+REPEAT_PREVIOUS_CODE_LENGTH = 0xFE
+REPEAT_ZERO_CODE_LENGTH = 0xFF
+MIN_CODE_LENGTH_REPEATS = 3
+
+# Shorter messages are counted with Counter, it's faster than NumPy for them
+NUMPY_MIN_MESSAGE_LENGTH = 1 << 12
+
+# Symbol indexes up to this value are counted with numpy.bincount,
+# larger ones - with numpy.unique
+BINCOUNT_MAX_SYMBOL_INDEX = 1 << 17
+
+# Typecodes of array with unsigned integers that are counted with NumPy
+UNSIGNED_TYPECODES = 'BHILQ'
+
+# Length of the first block that is searched for first occurrence of symbols
+FIRST_OCCURRENCE_BLOCK_LENGTH = 1 << 12
+
+# Length of data slice that is counted by one process
+PARALLEL_COUNTING_SLICE_LENGTH = 1 << 24
+
+# Codes are packed with NumPy to pairs of 32-bit words, so they can't
+# be longer than a word
+MAX_NUMPY_CODE_LENGTH = 32
+
+# Amount of symbols that are packed with NumPy at once
+NUMPY_PACKING_BLOCK_LENGTH = 1 << 20
+
 
 def get_symbols_with_frequency(message):
-    """Get frequency for symbols in the message"""
+    """Get frequency for symbols in the message
+
+    Strings and bytes-like messages are counted with NumPy if it's installed,
+    other messages - with Counter. Symbols are in order of first occurrence.
+    """
+
+    symbol_indexes = get_symbol_indexes_array(message)
+
+    # Counter gets 1-byte bytes from mmap and signed bytes from memoryview
+    # with format 'b', so they are counted as unsigned bytes like by NumPy
+    if symbol_indexes is None and is_byte_buffer(message):
+        with memoryview(message) as message_view, \
+                message_view.cast('B') as byte_view:
+            return dict(Counter(byte_view))
+
+    if symbol_indexes is None:
+        return dict(Counter(message))
+
+    are_characters = isinstance(message, str)
+
+    return {
+        get_symbol(symbol_index, are_characters): frequency
+        for symbol_index, frequency
+        in get_symbol_indexes_with_frequency(symbol_indexes).items()
+    }
+
+
+def get_symbol_indexes_array(message):
+    """Get NumPy array with symbol indexes of message without copying bytes
+
+    Returns None if message can't be counted with NumPy.
+    """
+
+    if numpy is None or len(message) < NUMPY_MIN_MESSAGE_LENGTH:
+        return None
+
+    if isinstance(message, str):
+        if message.isascii():
+            return numpy.frombuffer(message.encode('ascii'), numpy.uint8)
+
+        try:
+            return numpy.frombuffer(message.encode('utf-32-le'), '<u4')
+        except UnicodeEncodeError:
+            return None
+
+    if isinstance(message, (bytes, bytearray)) or is_byte_buffer(message):
+        return numpy.frombuffer(message, numpy.uint8)
+
+    # Arrays of unsigned integers, for example token ids
+    if isinstance(message, array) and message.typecode in UNSIGNED_TYPECODES:
+        return numpy.frombuffer(message, message.typecode)
+
+    if isinstance(message, numpy.ndarray) and message.dtype.kind == 'u':
+        return message
+
+    return None
+
+
+def is_byte_buffer(message):
+    """Check is message mmap or memoryview of bytes"""
+
+    return isinstance(message, mmap) or \
+        isinstance(message, memoryview) and message.format in ('B', 'b', 'c')
+
+
+def get_symbol_indexes_with_frequency(symbol_indexes):
+    """Get frequency for symbol indexes in NumPy array"""
+
+    if int(symbol_indexes.max()) <= BINCOUNT_MAX_SYMBOL_INDEX:
+        frequencies = numpy.bincount(symbol_indexes)
+        symbols_amount = numpy.count_nonzero(frequencies)
+    else:
+        present_symbol_indexes, present_frequencies = numpy.unique(
+            symbol_indexes, return_counts=True
+        )
+        frequencies = dict(zip(
+            present_symbol_indexes.tolist(), present_frequencies.tolist()
+        ))
+        symbols_amount = len(frequencies)
+
+    return {
+        symbol_index: int(frequencies[symbol_index])
+        for symbol_index in get_symbol_indexes_in_order_of_first_occurrence(
+            symbol_indexes, symbols_amount
+        )
+    }
+
+
+def get_symbol_indexes_in_order_of_first_occurrence(
+        symbol_indexes, symbols_amount):
+    """Get all different symbol indexes in order of their first occurrence
+
+    Symbols are searched in blocks that grow twice, because almost all
+    symbols usually occur near the message start.
+    """
+
+    ordered_symbol_indexes = {}
+    block_start = 0
+    block_length = FIRST_OCCURRENCE_BLOCK_LENGTH
+
+    while len(ordered_symbol_indexes) < symbols_amount:
+        block = symbol_indexes[block_start:block_start + block_length]
+        block_symbol_indexes, first_positions = numpy.unique(
+            block, return_index=True
+        )
+
+        for _, symbol_index in sorted(zip(
+                first_positions.tolist(), block_symbol_indexes.tolist())):
+            ordered_symbol_indexes.setdefault(symbol_index)
+
+        block_start += block_length
+        block_length *= 2
+
+    return list(ordered_symbol_indexes)
 
-    symbols_with_frequency = defaultdict(int)
 
-    for symbol in message:
-        # Increment frequency for current symbol
-        symbols_with_frequency[symbol] += 1
+def get_merged_symbols_with_frequency(symbols_with_frequency_parts):
+    """Get frequency for symbols by frequency for consecutive message parts"""
 
-    return dict(symbols_with_frequency)
+    symbols_with_frequency = {}
+
+    for symbols_with_frequency_part in symbols_with_frequency_parts:
+        for symbol, frequency in symbols_with_frequency_part.items():
+            symbols_with_frequency[symbol] = \
+                symbols_with_frequency.get(symbol, 0) + frequency
+
+    return symbols_with_frequency
+
+
+def get_symbols_with_frequency_in_parallel(data, processes=None):
+    """Get frequency for bytes counted by slices in process pool
+
+    Data is copied to shared memory once, so processes don't get their
+    slices through pickling.
+    """
+
+    if len(data) <= PARALLEL_COUNTING_SLICE_LENGTH:
+        return get_symbols_with_frequency(data)
+
+    shared_memory = SharedMemory(create=True, size=len(data))
+
+    try:
+        shared_memory.buf[:len(data)] = data
+        slice_starts = range(0, len(data), PARALLEL_COUNTING_SLICE_LENGTH)
+
+        with ProcessPoolExecutor(processes) as executor:
+            return get_merged_symbols_with_frequency(executor.map(
+                get_symbols_with_frequency_in_shared_memory,
+                [shared_memory.name] * len(slice_starts), slice_starts,
+                [start + PARALLEL_COUNTING_SLICE_LENGTH
+                 for start in slice_starts]
+            ))
+    finally:
+        shared_memory.close()
+        shared_memory.unlink()
+
+
+def get_symbols_with_frequency_in_shared_memory(
+        shared_memory_name, start, stop):
+    """Get frequency for bytes in slice of shared memory"""
+
+    shared_memory = SharedMemory(shared_memory_name)
+
+    try:
+        with shared_memory.buf[start:stop] as data:
+            return get_symbols_with_frequency(data)
+    finally:
+        shared_memory.close()
+
+
+def get_file_symbols_with_frequency(file_path, processes=None):
+    """Get frequency for bytes of file counted by mmap slices in processes"""
+
+    file_size = getsize(file_path)
+    slice_starts = range(0, file_size, PARALLEL_COUNTING_SLICE_LENGTH)
+
+    if len(slice_starts) < 2:
+        return get_symbols_with_frequency_in_file(file_path, 0, file_size)
+
+    with ProcessPoolExecutor(processes) as executor:
+        return get_merged_symbols_with_frequency(executor.map(
+            get_symbols_with_frequency_in_file,
+            [file_path] * len(slice_starts), slice_starts,
+            [start + PARALLEL_COUNTING_SLICE_LENGTH for start in slice_starts]
+        ))
+
+
+def get_symbols_with_frequency_in_file(file_path, start, stop):
+    """Get frequency for bytes in slice of memory-mapped file"""
+
+    if start >= stop or getsize(file_path) == 0:
+        return {}
+
+    with open(file_path, 'rb') as file, \
+            mmap(file.fileno(), 0, access=ACCESS_READ) as file_map, \
+            memoryview(file_map) as file_data, \
+            file_data[start:stop] as data:
+        return get_symbols_with_frequency(data)
 
 
 def get_symbols_with_probability(symbols_with_frequency):
@@ -150,10 +390,113 @@ def delete_first_2_nodes(tree):
     del tree_frequency[0]
 
 
+def get_huffman_code_tree_by_heap(symbols_with_frequency):
+    """Get Huffman code tree by symbols frequency using a heap
+
+    Works for any order of symbols in O(n log n). For symbols sorted by
+    frequency in ascending order the tree is the same as the one from
+    get_huffman_code_tree.
+    """
+
+    if symbols_with_frequency == {}:
+        return []
+
+    # Heap items are (frequency, order, node). New nodes get a decreasing
+    # negative order, so like bisect_left in add_node_created_by_first_2_nodes
+    # they go before all nodes with the same frequency
+    heap = [
+        (frequency, order, symbol)
+        for order, (symbol, frequency) in enumerate(
+            symbols_with_frequency.items()
+        )
+    ]
+    heapify(heap)
+    new_node_order = 0
+
+    while len(heap) > 1:
+        first_frequency, _, first_node = heappop(heap)
+        second_frequency, _, second_node = heappop(heap)
+        new_node_order -= 1
+
+        heappush(heap, (
+            first_frequency + second_frequency, new_node_order,
+            (first_node, second_node)
+        ))
+
+    return [heap[0][2]]
+
+
+def get_huffman_code_tree_by_two_queues(sorted_symbols_with_frequency):
+    """Get Huffman code tree by symbols sorted by frequency in linear time
+
+    Symbols must be sorted with get_sorted_symbols_with_frequency (in any
+    direction). The tree is the same as the one from
+    get_huffman_code_tree_by_heap for symbols in ascending order.
+    """
+
+    if sorted_symbols_with_frequency == {}:
+        return []
+
+    leaves = deque(
+        (frequency, symbol)
+        for symbol, frequency in sorted_symbols_with_frequency.items()
+    )
+
+    if leaves[0][0] > leaves[-1][0]:
+        leaves.reverse()
+
+    # New nodes are created in not decreasing order of frequency, so they
+    # are kept sorted in groups of nodes with the same frequency. Like
+    # bisect_left in add_node_created_by_first_2_nodes the newest node of
+    # a group goes first
+    new_node_groups = deque()
+
+    for _ in range(len(leaves) - 1):
+        first_frequency, first_node = pop_node_with_min_frequency(
+            leaves, new_node_groups
+        )
+        second_frequency, second_node = pop_node_with_min_frequency(
+            leaves, new_node_groups
+        )
+        new_node_frequency = first_frequency + second_frequency
+        new_node = (first_node, second_node)
+
+        if new_node_groups and new_node_groups[-1][0] == new_node_frequency:
+            new_node_groups[-1][1].append(new_node)
+        else:
+            new_node_groups.append((new_node_frequency, [new_node]))
+
+    if leaves:
+        return [leaves[0][1]]
+
+    return [new_node_groups[0][1][0]]
+
+
+def pop_node_with_min_frequency(leaves, new_node_groups):
+    """Pop node with min frequency from leaves and groups of new nodes"""
+
+    if new_node_groups and (
+            not leaves or new_node_groups[0][0] <= leaves[0][0]):
+        new_node_frequency, new_nodes = new_node_groups[0]
+        new_node = new_nodes.pop()
+
+        if not new_nodes:
+            new_node_groups.popleft()
+
+        return new_node_frequency, new_node
+
+    return leaves.popleft()
+
+
 def get_entropy(message):
     """Get entropy"""
 
-    symbols_with_frequency = get_symbols_with_frequency(message)
+    return get_entropy_by_frequency(get_symbols_with_frequency(message))
+
+
+def get_entropy_by_frequency(symbols_with_frequency):
+    """Get entropy by frequency for symbols in the message"""
+
     frequency_for_symbols = symbols_with_frequency.values()
     entropy = 0
     message_length = sum(frequency_for_symbols)
@@ -168,11 +511,17 @@ def get_entropy(message):
 
 
 def get_average_length_of_code_message(
-        symbols_with_code, symbols_with_frequency):
-    """Get average length of code message"""
+        symbols_with_code, symbols_with_frequency, message_length=None):
+    """Get average length of code message
+
+    If symbols are n-grams, message_length is length of the original message,
+    so average length is in bits per original symbol.
+    """
 
     average_length_of_code_message = 0
-    message_length = sum(symbols_with_frequency.values())
+
+    if message_length is None:
+        message_length = sum(symbols_with_frequency.values())
 
     for symbol, frequency in symbols_with_frequency.items():
         symbol_code_length = len(symbols_with_code[symbol])
@@ -186,6 +535,122 @@ def get_average_length_of_code_message(
     return round(average_length_of_code_message, 5)
 
 
+def get_symbols_with_code_length_by_frequency(symbols_with_frequency):
+    """Get length of Huffman code for symbols by their frequency"""
+
+    if len(symbols_with_frequency) < 2:
+        return dict.fromkeys(symbols_with_frequency, 1)
+
+    symbols, _, code_lengths = get_code_table(
+        *get_huffman_code_tree_by_heap(symbols_with_frequency)
+    )
+
+    return dict(zip(symbols, code_lengths))
+
+
+def get_length_limited_symbols_with_code_length(
+        symbols_with_frequency, max_code_length):
+    """Get optimal code lengths that aren't longer than max code length
+
+    Uses package-merge algorithm. Items that are chosen from every level
+    are always the cheapest ones, so only amount of symbols among them is
+    needed to get code lengths.
+    """
+
+    symbols = sorted(
+        symbols_with_frequency,
+        key=lambda symbol: (
+            symbols_with_frequency[symbol], get_symbol_index(symbol)
+        )
+    )
+    symbols_amount = len(symbols)
+
+    if symbols_amount == 1:
+        return {symbols[0]: 1}
+
+    if symbols_amount > 1 << max_code_length:
+        raise ValueError(
+            f'{symbols_amount} symbols need codes longer than '
+            f'{max_code_length} bits'
+        )
+
+    frequencies = [symbols_with_frequency[symbol] for symbol in symbols]
+    level_items = frequencies
+    # For every level from the longest code: True for packages,
+    # False for symbols
+    levels_with_package_flags = [[False] * symbols_amount]
+
+    for _ in range(max_code_length - 1):
+        packages = [
+            level_items[index] + level_items[index + 1]
+            for index in range(0, len(level_items) - 1, 2)
+        ]
+        level_items, package_flags = get_merged_symbols_and_packages(
+            frequencies, packages
+        )
+        levels_with_package_flags.append(package_flags)
+
+    code_lengths = [0] * symbols_amount
+    chosen_items_amount = 2 * symbols_amount - 2
+
+    for package_flags in reversed(levels_with_package_flags):
+        chosen_packages_amount = sum(package_flags[:chosen_items_amount])
+        chosen_symbols_amount = chosen_items_amount - chosen_packages_amount
+
+        for index in range(chosen_symbols_amount):
+            code_lengths[index] += 1
+
+        chosen_items_amount = 2 * chosen_packages_amount
+
+    return dict(zip(symbols, code_lengths))
+
+
+def get_merged_symbols_and_packages(frequencies, packages):
+    """Get sorted frequencies of symbols and packages with package flags"""
+
+    merged_items = []
+    package_flags = []
+    frequency_index = package_index = 0
+
+    while frequency_index < len(frequencies) or \
+            package_index < len(packages):
+        if package_index == len(packages) or (
+                frequency_index < len(frequencies) and
+                frequencies[frequency_index] <= packages[package_index]):
+            merged_items.append(frequencies[frequency_index])
+            package_flags.append(False)
+            frequency_index += 1
+        else:
+            merged_items.append(packages[package_index])
+            package_flags.append(True)
+            package_index += 1
+
+    return merged_items, package_flags
+
+
+def get_average_length_loss_for_max_code_length(
+        symbols_with_frequency, max_code_length):
+    """Get growth of average length of code message with code length limit"""
+
+    symbols_with_code = get_canonical_symbols_with_code(
+        get_symbols_with_code_length_by_frequency(symbols_with_frequency)
+    )
+    length_limited_symbols_with_code = get_canonical_symbols_with_code(
+        get_length_limited_symbols_with_code_length(
+            symbols_with_frequency, max_code_length
+        )
+    )
+
+    return round(
+        get_average_length_of_code_message(
+            length_limited_symbols_with_code, symbols_with_frequency
+        ) - get_average_length_of_code_message(
+            symbols_with_code, symbols_with_frequency
+        ),
+        5
+    )
+
+
 def is_tree(object_):
     """Check if this object is a tree"""
 
@@ -198,40 +663,721 @@ def get_huffman_code(symbols_with_code, message):
     return ''.join(symbols_with_code[symbol] for symbol in message)
 
 
-def get_symbols_with_code(code_tree, symbols_with_code, current_code=''):
-    """Get symbols and code for them"""
+def get_symbols_with_code_value(symbols_with_code):
+    """Get symbols with code as pair of integer value and length in bits"""
+
+    return {
+        symbol: (int(code, 2), len(code))
+        for symbol, code in symbols_with_code.items()
+    }
+
+
+def get_packed_huffman_code(symbols_with_code, message):
+    """Get Huffman code packed to bytes and its length in bits
+
+    Bits go from the most significant bit of the first byte. The last byte
+    is padded with zero bits, so packed code has (bit_length + 7) // 8 bytes.
+    """
 
-    left_node, right_node = code_tree[0], code_tree[1]
+    symbols_with_code_value = get_symbols_with_code_value(symbols_with_code)
+    symbol_indexes = get_symbol_indexes_array(message)
 
-    if is_tree(left_node) and is_tree(right_node):
-        get_symbols_with_code(
-            left_node, symbols_with_code, current_code + '0'
+    if symbol_indexes is not None and symbols_with_code_value and max(
+            code_length for _, code_length
+            in symbols_with_code_value.values()) <= MAX_NUMPY_CODE_LENGTH:
+        return get_packed_huffman_code_by_numpy(
+            symbols_with_code_value, symbol_indexes
         )
-        get_symbols_with_code(
-            right_node, symbols_with_code, current_code + '1'
+
+    packed_code = bytearray()
+    bit_buffer = [0, 0]
+
+    bit_length = pack_huffman_code(
+        symbols_with_code_value, message, bit_buffer, packed_code
+    )
+    flush_bit_buffer(bit_buffer, packed_code)
+
+    return bytes(packed_code), bit_length
+
+
+def get_packed_huffman_code_by_numpy(symbols_with_code_value, symbol_indexes):
+    """Get packed Huffman code for NumPy array with symbol indexes
+
+    Codes are gathered by symbol indexes from dense tables, bit offsets of
+    codes are cumulative sum of their lengths and codes are ORed to
+    big-endian 32-bit words, so packed code is the same as from
+    pack_huffman_code. Array is packed by blocks, the last incomplete word
+    of block is carried to the next block.
+    """
+
+    code_values, code_lengths = get_code_value_tables(symbols_with_code_value)
+
+    return get_packed_huffman_code_for_symbol_indexes(
+        code_values, code_lengths, symbol_indexes
+    )
+
+
+def get_packed_huffman_code_for_symbol_indexes(
+        code_values, code_lengths, symbol_indexes):
+    """Get packed Huffman code for symbol indexes by NumPy code tables"""
+
+    packed_code = bytearray()
+    carry_value, carry_length = 0, 0
+
+    for block_start in range(
+            0, len(symbol_indexes), NUMPY_PACKING_BLOCK_LENGTH):
+        block = symbol_indexes[
+            block_start:block_start + NUMPY_PACKING_BLOCK_LENGTH
+        ]
+
+        if int(block.max()) >= len(code_lengths):
+            raise KeyError(int(block.max()))
+
+        block_code_lengths = code_lengths[block]
+
+        if not block_code_lengths.all():
+            raise KeyError(int(block[block_code_lengths.argmin()]))
+
+        words, carry_length = get_packed_words(
+            code_values[block], block_code_lengths, carry_length
         )
+        words[0] |= numpy.uint32(carry_value)
+        carry_value = int(words[-1])
 
-        return symbols_with_code
-
-    if is_tree(left_node):
-        new_code_tree = left_node
-        code_for_symbol = current_code + '1'
-        current_code = current_code + '0'
-        symbol = right_node
-    elif is_tree(right_node):
-        new_code_tree = right_node
-        code_for_symbol = current_code + '0'
-        current_code = current_code + '1'
-        symbol = left_node
-    else:
-        symbols_with_code[left_node] = current_code + '0'
-        symbols_with_code[right_node] = current_code + '1'
+        packed_code += words[:-1].astype('>u4').tobytes()
+
+    bit_length = len(packed_code) * 8 + carry_length
+    packed_code += carry_value.to_bytes(4, 'big')[:(carry_length + 7) >> 3]
+
+    return bytes(packed_code), bit_length
+
+
+def get_code_value_tables(symbols_with_code_value):
+    """Get NumPy arrays with code value and length for every symbol index
+
+    Code length is 0 for symbol indexes that have no code.
+    """
+
+    symbols_amount = max(map(get_symbol_index, symbols_with_code_value)) + 1
+    code_values = numpy.zeros(symbols_amount, numpy.uint64)
+    code_lengths = numpy.zeros(symbols_amount, numpy.uint8)
+
+    for symbol, (code_value, code_length) in symbols_with_code_value.items():
+        code_values[get_symbol_index(symbol)] = code_value
+        code_lengths[get_symbol_index(symbol)] = code_length
+
+    return code_values, code_lengths
+
+
+def get_packed_words(code_values, code_lengths, first_code_start):
+    """Get 32-bit words with codes and amount of bits in the last word
+
+    The first code starts from bit first_code_start of the first word. The
+    last word is incomplete, it has less than 32 bits of codes.
+    """
+
+    code_ends = numpy.cumsum(code_lengths, dtype=numpy.int64)
+    code_ends += first_code_start
+    word_indexes = code_ends - code_lengths
+    word_indexes >>= 5
+    last_code_end = int(code_ends[-1])
+
+    # Code isn't longer than 32 bits, so it's in 64 bits that start from
+    # the word where it starts: high half is this word, low half - the next
+    shifts = word_indexes << 5
+    shifts += 64
+    shifts -= code_ends
+    word_pairs = code_values << shifts.view(numpy.uint64)
+
+    # Codes are in order of words, so codes of every word are ORed at once
+    first_codes = numpy.flatnonzero(word_indexes[1:] != word_indexes[:-1])
+    first_codes = numpy.concatenate(([0], first_codes + 1))
+    first_code_word_indexes = word_indexes[first_codes]
+    word_pairs = numpy.bitwise_or.reduceat(word_pairs, first_codes)
 
-        return symbols_with_code
+    words = numpy.zeros((last_code_end >> 5) + 2, numpy.uint32)
+    words[first_code_word_indexes] = word_pairs >> numpy.uint64(32)
+    words[first_code_word_indexes + 1] |= word_pairs.astype(numpy.uint32)
 
-    symbols_with_code[symbol] = code_for_symbol
+    return words[:(last_code_end >> 5) + 1], last_code_end & 31
 
-    return get_symbols_with_code(new_code_tree, symbols_with_code, current_code)
+
+def pack_huffman_code(
+        symbols_with_code_value, symbols, bit_buffer, packed_code):
+    """Pack code for symbols to bytearray and get amount of packed bits
+
+    Bit buffer is a list [value, length] with bits that don't fill
+    a whole byte yet, so packing can be continued with the next symbols.
+    """
+
+    buffer_value, buffer_length = bit_buffer
+    bit_length = -buffer_length
+
+    for symbol in symbols:
+        code_value, code_length = symbols_with_code_value[symbol]
+        buffer_value = (buffer_value << code_length) | code_value
+        buffer_length += code_length
+
+        if buffer_length >= BIT_BUFFER_FLUSH_LENGTH:
+            rest_length = buffer_length & 7
+            packed_code += (buffer_value >> rest_length).to_bytes(
+                buffer_length >> 3, 'big'
+            )
+            bit_length += buffer_length - rest_length
+            buffer_value &= (1 << rest_length) - 1
+            buffer_length = rest_length
+
+    bit_buffer[0], bit_buffer[1] = buffer_value, buffer_length
+    bit_length += buffer_length
+
+    return bit_length
+
+
+def flush_bit_buffer(bit_buffer, packed_code):
+    """Flush bit buffer to bytearray padding last byte with zero bits"""
+
+    buffer_value, buffer_length = bit_buffer
+    padding_length = -buffer_length & 7
+
+    packed_code += (buffer_value << padding_length).to_bytes(
+        (buffer_length + padding_length) >> 3, 'big'
+    )
+    bit_buffer[0], bit_buffer[1] = 0, 0
+
+
+def get_huffman_code_from_packed_code(packed_code, bit_length):
+    """Get string with Huffman code from packed code"""
+
+    if bit_length == 0:
+        return ''
+
+    huffman_code = bin(int.from_bytes(packed_code, 'big'))[2:].zfill(
+        len(packed_code) * 8
+    )
+
+    return huffman_code[:bit_length]
+
+
+def get_decoding_tables(
+        symbols_with_code, lookup_bits=DECODING_LOOKUP_BITS):
+    """Get lookup tables for decoding Huffman code
+
+    Table is (bits, symbols, code lengths) and is indexed by the next bits
+    of the code. Codes that are longer than the table bits have code length
+    0 and a secondary table with the next bits instead of symbol.
+    """
+
+    return get_decoding_tables_for_codes(
+        [
+            (code_value, code_length, symbol)
+            for symbol, (code_value, code_length)
+            in get_symbols_with_code_value(symbols_with_code).items()
+        ],
+        lookup_bits
+    )
+
+
+def get_decoding_tables_for_codes(codes, lookup_bits=DECODING_LOOKUP_BITS):
+    """Get lookup tables for decoding by (code value, code length, symbol)"""
+
+    max_code_length = max(
+        (code_length for _, code_length, _ in codes), default=0
+    )
+    table_bits = min(lookup_bits, max_code_length)
+
+    return (
+        get_decoding_table(codes, 0, table_bits, lookup_bits),
+        max_code_length
+    )
+
+
+def get_decoding_table(codes, prefix_length, table_bits, lookup_bits):
+    """Get decoding table for codes that have the same prefix"""
+
+    table_size = 1 << table_bits
+    table_symbols = [None] * table_size
+    table_lengths = [0] * table_size
+    long_codes = defaultdict(list)
+
+    for code_value, code_length, symbol in codes:
+        rest_length = code_length - prefix_length
+        rest_value = code_value & ((1 << rest_length) - 1)
+
+        if rest_length > table_bits:
+            index = rest_value >> (rest_length - table_bits)
+            long_codes[index].append((code_value, code_length, symbol))
+            continue
+
+        first_index = rest_value << (table_bits - rest_length)
+        last_index = first_index + (1 << (table_bits - rest_length))
+
+        for index in range(first_index, last_index):
+            table_symbols[index] = symbol
+            table_lengths[index] = code_length
+
+    for index, codes_with_prefix in long_codes.items():
+        secondary_prefix_length = prefix_length + table_bits
+        secondary_table_bits = min(
+            lookup_bits,
+            max(code_length for _, code_length, _ in codes_with_prefix)
+            - secondary_prefix_length
+        )
+
+        table_symbols[index] = get_decoding_table(
+            codes_with_prefix, secondary_prefix_length,
+            secondary_table_bits, lookup_bits
+        )
+
+    return table_bits, table_symbols, table_lengths
+
+
+def get_message_from_packed_huffman_code(
+        decoding_tables, packed_code, bit_length):
+    """Get message from packed Huffman code
+
+    Benchmark for 1 MB of random text with 23 symbols on CPython 3.11:
+    get_packed_huffman_code - about 6 MB/s (about 20 MB/s with NumPy),
+    decoding - about 5 MB/s.
+    """
+
+    return ''.join(get_symbols_from_packed_huffman_code(
+        decoding_tables, packed_code, bit_length
+    ))
+
+
+def get_symbols_from_packed_huffman_code(
+        decoding_tables, packed_code, bit_length):
+    """Get list of symbols from packed Huffman code"""
+
+    symbols = []
+
+    unpack_huffman_code(
+        decoding_tables, packed_code, [0, 0, bit_length], symbols
+    )
+
+    return symbols
+
+
+def unpack_huffman_code(
+        decoding_tables, packed_code, unpacking_state, symbols):
+    """Unpack symbols from packed code and add them to list
+
+    Unpacking state is a list [buffer value, buffer length, bits left] where
+    bits left is amount of code bits that aren't decoded yet. Bits of the last
+    symbol that is split between 2 parts of packed code stay in the buffer,
+    so unpacking can be continued with the next part.
+    """
+
+    (table_bits, table_symbols, table_lengths), max_code_length = \
+        decoding_tables
+    buffer_value, buffer_length, bits_left = unpacking_state
+    table_mask = (1 << table_bits) - 1
+    packed_code_length = len(packed_code)
+    position = 0
+    add_symbol = symbols.append
+
+    while bits_left > 0:
+        if buffer_length < max_code_length:
+            if position < packed_code_length:
+                new_bytes = packed_code[
+                    position:position + DECODING_REFILL_BYTES
+                ]
+                new_bits_length = len(new_bytes) << 3
+                position += DECODING_REFILL_BYTES
+
+                buffer_value = (
+                    (buffer_value & ((1 << buffer_length) - 1))
+                    << new_bits_length
+                ) | int.from_bytes(new_bytes, 'big')
+                buffer_length += new_bits_length
+                continue
+
+            if buffer_length < bits_left:
+                break
+
+            # Only padding is left after the last symbol
+            padding_length = max_code_length - buffer_length
+            buffer_value <<= padding_length
+            buffer_length += padding_length
+
+        index = (buffer_value >> (buffer_length - table_bits)) & table_mask
+        code_length = table_lengths[index]
+
+        if code_length == 0:
+            symbol, code_length = get_symbol_from_secondary_table(
+                table_symbols[index], buffer_value,
+                buffer_length - table_bits
+            )
+        else:
+            symbol = table_symbols[index]
+
+        buffer_length -= code_length
+        bits_left -= code_length
+        add_symbol(symbol)
+
+    unpacking_state[0] = buffer_value & ((1 << buffer_length) - 1)
+    unpacking_state[1], unpacking_state[2] = buffer_length, bits_left
+
+
+def get_symbol_from_secondary_table(table, buffer_value, buffer_length):
+    """Get symbol and code length from secondary decoding tables"""
+
+    while table is not None:
+        table_bits, table_symbols, table_lengths = table
+        buffer_length -= table_bits
+        index = (buffer_value >> buffer_length) & ((1 << table_bits) - 1)
+
+        if table_lengths[index] != 0:
+            return table_symbols[index], table_lengths[index]
+
+        table = table_symbols[index]
+
+    raise ValueError('Invalid Huffman code')
+
+
+def get_symbols_with_code_length(symbols_with_code):
+    """Get symbols with length of their code"""
+
+    return {symbol: len(code) for symbol, code in symbols_with_code.items()}
+
+
+def get_symbol_index(symbol):
+    """Get integer index of symbol - its code point for characters"""
+
+    return ord(symbol) if isinstance(symbol, str) else symbol
+
+
+def get_symbol(symbol_index, are_characters):
+    """Get character or integer symbol by its index"""
+
+    return chr(symbol_index) if are_characters else symbol_index
+
+
+def get_canonical_symbols_with_code(symbols_with_code_length):
+    """Get canonical Huffman code for symbols by length of their code
+
+    Symbols are sorted by code length and then by symbol index, so the same
+    code lengths always give the same code.
+    """
+
+    symbols_with_code = {}
+    code_value = 0
+    previous_code_length = 0
+
+    for symbol, code_length in sorted(
+            symbols_with_code_length.items(),
+            key=lambda symbol_and_length: (
+                symbol_and_length[1], get_symbol_index(symbol_and_length[0])
+            )):
+        code_value <<= code_length - previous_code_length
+        symbols_with_code[symbol] = format(code_value, f'0{code_length}b')
+
+        code_value += 1
+        previous_code_length = code_length
+
+    return symbols_with_code
+
+
+def get_varint(number):
+    """Get bytes with number in LEB128 varint format"""
+
+    varint = bytearray()
+
+    while number > 0x7F:
+        varint.append((number & 0x7F) | 0x80)
+        number >>= 7
+
+    varint.append(number)
+
+    return bytes(varint)
+
+
+def read_varint(data, position):
+    """Read number in LEB128 varint format and get it with next position"""
+
+    number = 0
+    shift = 0
+
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return number, position
+
+
+def get_serialized_code_lengths(symbols_with_code_length):
+    """Get bytes with code lengths of all symbols up to the max symbol index
+
+    Runs of the same code length are coded like in DEFLATE: code length
+    that isn't used by symbol is 0, runs of zeros and runs of the same
+    length are replaced by repeat mark and amount of repeats.
+    """
+
+    return get_serialized_code_lengths_by_symbol_index(
+        get_code_lengths_by_symbol_index(symbols_with_code_length)
+    )
+
+
+def get_serialized_code_lengths_by_symbol_index(code_lengths):
+    """Get bytes with code lengths from list of them for every symbol index"""
+
+    serialized_code_lengths = bytearray(get_varint(len(code_lengths)))
+    previous_code_length = None
+    index = 0
+
+    while index < len(code_lengths):
+        code_length = code_lengths[index]
+        repeats = 1
+
+        while index + repeats < len(code_lengths) and \
+                code_lengths[index + repeats] == code_length:
+            repeats += 1
+
+        index += repeats
+
+        if code_length == previous_code_length or code_length == 0:
+            repeat_mark = REPEAT_ZERO_CODE_LENGTH if code_length == 0 \
+                else REPEAT_PREVIOUS_CODE_LENGTH
+        else:
+            serialized_code_lengths.append(code_length)
+            previous_code_length = code_length
+            repeats -= 1
+            repeat_mark = REPEAT_PREVIOUS_CODE_LENGTH
+
+        if repeats >= MIN_CODE_LENGTH_REPEATS:
+            serialized_code_lengths.append(repeat_mark)
+            serialized_code_lengths += get_varint(
+                repeats - MIN_CODE_LENGTH_REPEATS
+            )
+        else:
+            serialized_code_lengths += bytes([code_length]) * repeats
+
+    return bytes(serialized_code_lengths)
+
+
+def get_code_lengths_by_symbol_index(symbols_with_code_length):
+    """Get list with code length for every symbol index"""
+
+    symbols_amount = max(
+        map(get_symbol_index, symbols_with_code_length), default=-1
+    ) + 1
+    code_lengths = [0] * symbols_amount
+
+    for symbol, code_length in symbols_with_code_length.items():
+        if code_length > MAX_SERIALIZED_CODE_LENGTH:
+            raise ValueError(f'Code length {code_length} is too long')
+
+        code_lengths[get_symbol_index(symbol)] = code_length
+
+    return code_lengths
+
+
+def get_code_lengths_from_serialized(
+        serialized_code_lengths, position=0, are_characters=True):
+    """Get symbols with code length from serialized code lengths
+
+    Returns symbols with code length and position after serialized code
+    lengths. Symbols are characters or their integer indexes.
+    """
+
+    code_lengths, position = get_code_lengths_by_symbol_index_from_serialized(
+        serialized_code_lengths, position
+    )
+    symbols_with_code_length = {
+        get_symbol(index, are_characters): code_length
+        for index, code_length in enumerate(code_lengths)
+        if code_length != 0
+    }
+
+    return symbols_with_code_length, position
+
+
+def get_code_lengths_by_symbol_index_from_serialized(
+        serialized_code_lengths, position=0):
+    """Get code length for every symbol index and position after them"""
+
+    symbols_amount, position = read_varint(serialized_code_lengths, position)
+    code_lengths = []
+    previous_code_length = 0
+
+    while len(code_lengths) < symbols_amount:
+        code_length = serialized_code_lengths[position]
+        position += 1
+
+        if code_length <= MAX_SERIALIZED_CODE_LENGTH:
+            code_lengths.append(code_length)
+
+            if code_length != 0:
+                previous_code_length = code_length
+
+            continue
+
+        repeats, position = read_varint(serialized_code_lengths, position)
+        repeats += MIN_CODE_LENGTH_REPEATS
+
+        if code_length == REPEAT_ZERO_CODE_LENGTH:
+            code_lengths += [0] * repeats
+        else:
+            code_lengths += [previous_code_length] * repeats
+
+    return code_lengths, position
+
+
+def get_symbols_with_code(code_tree, symbols_with_code, current_code=''):
+    """Get symbols and code for them"""
+
+    for symbol, code in get_symbols_with_code_from_code_table(
+            get_code_table(code_tree)).items():
+        symbols_with_code[symbol] = current_code + code
+
+    return symbols_with_code
+
+
+def get_code_table(code_tree):
+    """Get symbols with values and lengths of their code for code tree
+
+    Tree is walked with a stack instead of recursion. Code table is a list
+    of symbols, array with code values and array with code lengths. Values
+    of codes that are longer than 64 bits are kept in a list.
+    """
+
+    symbols = []
+    code_values = []
+    code_lengths = []
+    nodes_with_code = [(code_tree, 0, 0)]
+
+    while nodes_with_code:
+        node, code_value, code_length = nodes_with_code.pop()
+
+        if is_tree(node):
+            code_value <<= 1
+            code_length += 1
+
+            nodes_with_code.append((node[1], code_value | 1, code_length))
+            nodes_with_code.append((node[0], code_value, code_length))
+        else:
+            symbols.append(node)
+            code_values.append(code_value)
+            # Code for the only symbol in the tree is 0
+            code_lengths.append(code_length or 1)
+
+    if max(code_lengths) <= 64:
+        code_values = array('Q', code_values)
+
+    return symbols, code_values, array('H', code_lengths)
+
+
+def get_symbols_with_code_from_code_table(code_table):
+    """Get symbols with string code for code table"""
+
+    return {
+        symbol: format(code_value, f'0{code_length}b')
+        for symbol, code_value, code_length in zip(*code_table)
+    }
+
+
+def get_symbols_with_code_value_from_code_table(code_table):
+    """Get symbols with pair of code value and length for code table"""
+
+    symbols, code_values, code_lengths = code_table
+
+    return dict(zip(symbols, zip(code_values, code_lengths)))
+
+
+class HuffmanModel:
+    """Statistics and Huffman code for frequency of symbols in the message
+
+    Every statistic is computed from the frequency when it's needed first
+    time and then kept. Probabilities and average length of code message
+    are exact fractions.
+    """
+
+    __slots__ = (
+        'symbols_with_frequency', 'message_length',
+        '_symbols_with_probability', '_entropy', '_symbols_with_code',
+        '_average_length_of_code_message'
+    )
+
+    def __init__(self, symbols_with_frequency):
+        self.symbols_with_frequency = symbols_with_frequency
+        self.message_length = sum(symbols_with_frequency.values())
+        self._symbols_with_probability = None
+        self._entropy = None
+        self._symbols_with_code = None
+        self._average_length_of_code_message = None
+
+    @classmethod
+    def from_message(cls, message):
+        """Get model for message counting its symbols once"""
+
+        return cls(get_symbols_with_frequency(message))
+
+    @property
+    def symbols_with_probability(self):
+        """Symbols with exact probability"""
+
+        if self._symbols_with_probability is None:
+            self._symbols_with_probability = {
+                symbol: Fraction(frequency, self.message_length)
+                for symbol, frequency in self.symbols_with_frequency.items()
+            }
+
+        return self._symbols_with_probability
+
+    @property
+    def entropy(self):
+        """Entropy in bits per symbol"""
+
+        if self._entropy is None:
+            self._entropy = 0.0
+
+            if self.message_length > 0:
+                self._entropy = log2(self.message_length) - sum(
+                    frequency * log2(frequency)
+                    for frequency in self.symbols_with_frequency.values()
+                ) / self.message_length
+
+        return self._entropy
+
+    @property
+    def symbols_with_code(self):
+        """Symbols with Huffman code like in print_all_info_for_huffman_code"""
+
+        if self._symbols_with_code is None:
+            code_tree = get_huffman_code_tree_by_heap(
+                get_sorted_symbols_with_frequency(
+                    self.symbols_with_frequency, False
+                )
+            )
+            self._symbols_with_code = get_symbols_with_code(*code_tree, {}) \
+                if code_tree else {}
+
+        return self._symbols_with_code
+
+    @property
+    def average_length_of_code_message(self):
+        """Exact average length of code in bits per symbol"""
+
+        if self._average_length_of_code_message is None:
+            self._average_length_of_code_message = Fraction(
+                sum(
+                    frequency * len(self.symbols_with_code[symbol])
+                    for symbol, frequency
+                    in self.symbols_with_frequency.items()
+                ),
+                self.message_length or 1
+            )
+
+        return self._average_length_of_code_message
+
+    @property
+    def redundancy(self):
+        """Difference between average length of code message and entropy"""
+
+        return float(self.average_length_of_code_message) - self.entropy
 
 
 def print_all_info_for_huffman_code(message):
@@ -239,19 +1385,17 @@ def print_all_info_for_huffman_code(message):
 
     print(f'Initial message: {message}\n')
 
-    symbols_with_frequency = get_symbols_with_frequency(message)
-    sorted_symbols_with_frequency = get_sorted_symbols_with_frequency(
-        symbols_with_frequency, False
-    )
+    huffman_model = HuffmanModel.from_message(message)
+    symbols_with_frequency = huffman_model.symbols_with_frequency
+    symbols_with_code = huffman_model.symbols_with_code
+    # Printed statistics are rounded like in the functions for them
     symbols_with_probability = get_symbols_with_probability(
         symbols_with_frequency
     )
-    code_tree = get_huffman_code_tree(sorted_symbols_with_frequency)
-    symbols_with_code = get_symbols_with_code(*code_tree, {})
     average_length_of_code_message = get_average_length_of_code_message(
         symbols_with_code, symbols_with_frequency
     )
-    entropy = get_entropy(message)
+    entropy = get_entropy_by_frequency(symbols_with_frequency)
     huffman_code = get_huffman_code(symbols_with_code, message)
 
     print_frequency_and_probability_for_symbols(
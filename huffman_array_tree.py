@@ -0,0 +1,145 @@
+"""Huffman code tree in flat arrays instead of nested tuples"""
+
+from array import array
+
+
+NO_NODE = -1
+
+
+class ArrayHuffmanCodeTree:
+    """Huffman code tree with nodes in arrays by their index
+
+    Leaves are nodes 0 ... n - 1 with symbols sorted by frequency in
+    ascending order, internal nodes are n ... 2n - 2 in order of creation
+    and the root is the last node. Nodes have no Python objects, so symbol
+    can be any object, including tuple.
+    """
+
+    __slots__ = ('symbols', 'weights', 'parents', 'lefts', 'rights')
+
+    def __init__(self, symbols_with_frequency):
+        self.symbols = sorted(
+            symbols_with_frequency, key=symbols_with_frequency.__getitem__
+        )
+        leaves_amount = len(self.symbols)
+        nodes_amount = max(2 * leaves_amount - 1, 0)
+
+        self.weights = array(
+            'Q', (symbols_with_frequency[symbol] for symbol in self.symbols)
+        )
+        self.weights += array('Q', bytes(8 * (nodes_amount - leaves_amount)))
+        self.parents = array('l', [NO_NODE]) * nodes_amount
+        self.lefts = array('l', [NO_NODE]) * nodes_amount
+        self.rights = array('l', [NO_NODE]) * nodes_amount
+
+        # Tree is built by two queues: sorted leaves and internal nodes that
+        # are created in order of their weights, so their queue is a range
+        # of node indexes. Like in get_huffman_code_tree internal node goes
+        # before leaf with the same weight and the newest of internal nodes
+        # with the same weight goes first, so they are taken from the range
+        # through stack.
+        weights, parents = self.weights, self.parents
+        leaf = 0
+        internal_node = leaves_amount
+        internal_nodes_with_min_weight = []
+
+        for node in range(leaves_amount, nodes_amount):
+            children = []
+
+            for _ in range(2):
+                while internal_node < node and (
+                        not internal_nodes_with_min_weight or
+                        weights[internal_node] ==
+                        weights[internal_nodes_with_min_weight[0]]):
+                    internal_nodes_with_min_weight.append(internal_node)
+                    internal_node += 1
+
+                if internal_nodes_with_min_weight and (
+                        leaf == leaves_amount or
+                        weights[internal_nodes_with_min_weight[0]] <=
+                        weights[leaf]):
+                    children.append(internal_nodes_with_min_weight.pop())
+                else:
+                    children.append(leaf)
+                    leaf += 1
+
+            left, right = children
+            self.lefts[node], self.rights[node] = left, right
+            parents[left] = parents[right] = node
+            weights[node] = weights[left] + weights[right]
+
+    def __len__(self):
+        return len(self.weights)
+
+    @property
+    def root(self):
+        """Index of root node, NO_NODE for empty tree"""
+
+        return len(self.weights) - 1
+
+    def get_code_lengths(self):
+        """Get array with code length for every node
+
+        Parent has larger index than its children, so depths are filled
+        from the root in one pass.
+        """
+
+        parents = self.parents
+        code_lengths = array('H', bytes(2 * len(self)))
+
+        for node in range(self.root - 1, -1, -1):
+            code_lengths[node] = code_lengths[parents[node]] + 1
+
+        return code_lengths
+
+    def get_code_table(self):
+        """Get code table like get_code_table from huffman for this tree"""
+
+        leaves_amount = len(self.symbols)
+        parents, rights = self.parents, self.rights
+        code_lengths = self.get_code_lengths()
+        code_values = array('Q', bytes(8 * len(self))) \
+            if max(code_lengths, default=0) <= 64 else [0] * len(self)
+
+        for node in range(self.root - 1, -1, -1):
+            parent = parents[node]
+            code_values[node] = \
+                (code_values[parent] << 1) | (rights[parent] == node)
+
+        leaf_code_lengths = code_lengths[:leaves_amount]
+
+        # Code for the only symbol in the tree is 0
+        if leaves_amount == 1:
+            leaf_code_lengths[0] = 1
+
+        return (
+            list(self.symbols), code_values[:leaves_amount], leaf_code_lengths
+        )
+
+    def get_symbols_from_packed_code(self, packed_code, bit_length):
+        """Get list of symbols from packed code walking tree by bits"""
+
+        symbols = self.symbols
+        leaves_amount = len(symbols)
+        lefts, rights = self.lefts, self.rights
+        root = self.root
+        decoded_symbols = []
+        node = root
+
+        if leaves_amount == 1:
+            return [symbols[0]] * bit_length
+
+        for bit_index in range(bit_length):
+            if (packed_code[bit_index >> 3] >> (7 - (bit_index & 7))) & 1:
+                node = rights[node]
+            else:
+                node = lefts[node]
+
+            if node < leaves_amount:
+                decoded_symbols.append(symbols[node])
+                node = root
+
+        if node != root:
+            raise ValueError('Packed code ended inside symbol code')
+
+        return decoded_symbols
@@ -0,0 +1,114 @@
+"""Calculate Huffman code for asyncio streams by frames"""
+
+from asyncio import IncompleteReadError, get_running_loop
+from collections import deque
+
+from huffman import get_varint
+from huffman_blocks import get_huffman_code_block, get_message_block
+from huffman_stream import STREAM_CHUNK_SIZE
+
+
+# Amount of chunks that are coded in executor while the next chunks are read
+MAX_PENDING_FRAMES = 4
+
+# Frame with length 0 is the end of stream
+END_FRAME = get_varint(0)
+
+
+async def write_huffman_code_frames(
+        reader, writer, chunk_size=STREAM_CHUNK_SIZE, executor=None,
+        max_pending_frames=MAX_PENDING_FRAMES):
+    """Write frames with Huffman code for bytes from StreamReader
+
+    Every chunk is coded in executor as a block with its own code table
+    (see get_huffman_code_block) and written as varint length and block.
+    Only max_pending_frames chunks are coded at once and writer is drained
+    after every frame, so slow reader of output slows down reading of input.
+    Pass ProcessPoolExecutor to code chunks in parallel without GIL.
+    """
+
+    async for huffman_code_block in get_results_from_executor(
+            read_chunks_from_stream_reader(reader, chunk_size),
+            get_huffman_code_block, executor, max_pending_frames):
+        writer.write(get_varint(len(huffman_code_block)))
+        writer.write(huffman_code_block)
+        await writer.drain()
+
+    writer.write(END_FRAME)
+    await writer.drain()
+
+
+async def write_message_from_huffman_code_frames(
+        reader, writer, executor=None, max_pending_frames=MAX_PENDING_FRAMES):
+    """Write bytes decoded from frames of write_huffman_code_frames"""
+
+    async for message_block in get_results_from_executor(
+            read_frames_from_stream_reader(reader), get_message_block,
+            executor, max_pending_frames, False):
+        writer.write(message_block)
+        await writer.drain()
+
+
+async def get_results_from_executor(
+        chunks, function, executor, max_pending_results, *arguments):
+    """Get results of function for chunks in order of chunks
+
+    Function is called in executor for max_pending_results chunks at once,
+    the next chunk is read only when the first result is taken.
+    """
+
+    loop = get_running_loop()
+    pending_results = deque()
+
+    async for chunk in chunks:
+        pending_results.append(
+            loop.run_in_executor(executor, function, chunk, *arguments)
+        )
+
+        if len(pending_results) >= max_pending_results:
+            yield await pending_results.popleft()
+
+    while pending_results:
+        yield await pending_results.popleft()
+
+
+async def read_chunks_from_stream_reader(reader, chunk_size):
+    """Read chunks from StreamReader until it ends"""
+
+    while True:
+        chunk = await reader.read(chunk_size)
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+async def read_frames_from_stream_reader(reader):
+    """Read frames from StreamReader until end frame"""
+
+    try:
+        while True:
+            frame_length = await read_varint_from_stream_reader(reader)
+
+            if frame_length == 0:
+                return
+
+            yield await reader.readexactly(frame_length)
+    except IncompleteReadError as error:
+        raise ValueError('Stream ended inside frame') from error
+
+
+async def read_varint_from_stream_reader(reader):
+    """Read number in LEB128 varint format from StreamReader"""
+
+    number = 0
+    shift = 0
+
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        number |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return number
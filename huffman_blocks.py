@@ -0,0 +1,103 @@
+"""Calculate Huffman code for message by independent blocks in parallel"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from huffman import (
+    get_symbols_with_frequency, get_symbols_with_code_length_by_frequency,
+    get_canonical_symbols_with_code, get_packed_huffman_code,
+    get_decoding_tables, get_symbols_from_packed_huffman_code,
+    get_serialized_code_lengths, get_code_lengths_from_serialized,
+    get_varint, read_varint
+)
+
+
+BLOCK_SIZE = 1 << 20
+
+
+def get_huffman_code_block(message_block):
+    """Get block with its own code table and packed Huffman code
+
+    Block is serialized code lengths, varint with length of code in bits
+    and packed code.
+    """
+
+    symbols_with_code_length = get_symbols_with_code_length_by_frequency(
+        get_symbols_with_frequency(message_block)
+    )
+    packed_code, bit_length = get_packed_huffman_code(
+        get_canonical_symbols_with_code(symbols_with_code_length),
+        message_block
+    )
+
+    return get_serialized_code_lengths(symbols_with_code_length) + \
+        get_varint(bit_length) + packed_code
+
+
+def get_message_block(huffman_code_block, are_characters=True):
+    """Get message block from block with Huffman code"""
+
+    symbols_with_code_length, position = get_code_lengths_from_serialized(
+        huffman_code_block, 0, are_characters
+    )
+    bit_length, position = read_varint(huffman_code_block, position)
+    symbols = get_symbols_from_packed_huffman_code(
+        get_decoding_tables(
+            get_canonical_symbols_with_code(symbols_with_code_length)
+        ),
+        memoryview(huffman_code_block)[position:], bit_length
+    )
+
+    return ''.join(symbols) if are_characters else bytes(symbols)
+
+
+def get_huffman_code_blocks(message, block_size=BLOCK_SIZE, processes=None):
+    """Get stream of blocks with Huffman code for message
+
+    Blocks are compressed in process pool. Stream starts with flag for
+    text (1) or bytes (0), then every block goes with varint length.
+    """
+
+    message_blocks = [
+        message[block_start:block_start + block_size]
+        for block_start in range(0, len(message), block_size)
+    ]
+    huffman_code_blocks = bytearray([isinstance(message, str)])
+
+    for huffman_code_block in get_mapped_in_process_pool(
+            get_huffman_code_block, processes, message_blocks):
+        huffman_code_blocks += get_varint(len(huffman_code_block))
+        huffman_code_blocks += huffman_code_block
+
+    return bytes(huffman_code_blocks)
+
+
+def get_message_from_huffman_code_blocks(huffman_code_blocks, processes=None):
+    """Get message from stream of blocks decoded in process pool"""
+
+    are_characters = huffman_code_blocks[0] == 1
+    blocks = []
+    position = 1
+
+    while position < len(huffman_code_blocks):
+        block_length, position = read_varint(huffman_code_blocks, position)
+        blocks.append(huffman_code_blocks[position:position + block_length])
+        position += block_length
+
+    message_blocks = get_mapped_in_process_pool(
+        get_message_block, processes, blocks, [are_characters] * len(blocks)
+    )
+
+    return ('' if are_characters else b'').join(message_blocks)
+
+
+def get_mapped_in_process_pool(function, processes, *iterables):
+    """Get results of function for items in process pool
+
+    Function is called in this process if there is only one item.
+    """
+
+    if len(iterables[0]) < 2 or processes == 1:
+        return list(map(function, *iterables))
+
+    with ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(function, *iterables))
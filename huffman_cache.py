@@ -0,0 +1,114 @@
+"""Cache Huffman code tables by fingerprint of symbols frequency"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+
+from huffman import (
+    get_symbol_index, get_symbols_with_code_length_by_frequency,
+    get_canonical_symbols_with_code
+)
+
+
+CODE_TABLE_CACHE_SIZE = 1024
+
+
+def get_quantized_symbols_with_frequency(
+        symbols_with_frequency, quantization_bits):
+    """Get frequency for symbols scaled to quantization_bits bits
+
+    Symbols that are in the message keep frequency at least 1.
+    """
+
+    message_length = sum(symbols_with_frequency.values())
+    scale = 1 << quantization_bits
+
+    return {
+        symbol: max(1, round(frequency * scale / message_length))
+        for symbol, frequency in symbols_with_frequency.items()
+    }
+
+
+def get_histogram_fingerprint(symbols_with_frequency, quantization_bits=None):
+    """Get fingerprint of symbols frequency that doesn't depend on order"""
+
+    if quantization_bits is not None:
+        symbols_with_frequency = get_quantized_symbols_with_frequency(
+            symbols_with_frequency, quantization_bits
+        )
+
+    sorted_symbols_with_frequency = sorted(
+        symbols_with_frequency.items(),
+        key=lambda symbol_and_frequency: get_symbol_index(
+            symbol_and_frequency[0]
+        )
+    )
+
+    return blake2b(
+        repr(sorted_symbols_with_frequency).encode(), digest_size=16
+    ).digest()
+
+
+class CodeTableCache:
+    """Bounded thread-safe LRU cache of canonical Huffman code tables
+
+    Code tables are shared between callers, so they must not be changed.
+    """
+
+    def __init__(
+            self, max_size=CODE_TABLE_CACHE_SIZE, quantization_bits=None):
+        self.max_size = max_size
+        self.quantization_bits = quantization_bits
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._code_tables = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._code_tables)
+
+    def get_symbols_with_code(self, symbols_with_frequency):
+        """Get canonical code for symbols frequency from cache or build it"""
+
+        fingerprint = get_histogram_fingerprint(
+            symbols_with_frequency, self.quantization_bits
+        )
+
+        with self._lock:
+            symbols_with_code = self._code_tables.get(fingerprint)
+
+            if symbols_with_code is not None:
+                self._code_tables.move_to_end(fingerprint)
+                self.hits += 1
+
+                return symbols_with_code
+
+            self.misses += 1
+
+        if self.quantization_bits is not None:
+            symbols_with_frequency = get_quantized_symbols_with_frequency(
+                symbols_with_frequency, self.quantization_bits
+            )
+
+        # Tree is built without lock, so other threads aren't blocked
+        symbols_with_code = get_canonical_symbols_with_code(
+            get_symbols_with_code_length_by_frequency(symbols_with_frequency)
+        )
+
+        with self._lock:
+            self._code_tables[fingerprint] = symbols_with_code
+            self._code_tables.move_to_end(fingerprint)
+
+            while len(self._code_tables) > self.max_size:
+                self._code_tables.popitem(last=False)
+                self.evictions += 1
+
+        return symbols_with_code
+
+    def clear(self):
+        """Remove all code tables and reset counters"""
+
+        with self._lock:
+            self._code_tables.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,167 @@
+"""Container with Huffman code blocks for random access decompression"""
+
+from bisect import bisect_right
+
+from crc import POLYNOMIAL, get_binary_code_for_polynomial, get_crc_for_bytes
+from huffman import (
+    get_symbols_with_frequency, get_symbols_with_code_length_by_frequency,
+    get_canonical_symbols_with_code, get_packed_huffman_code,
+    get_decoding_tables, get_symbols_from_packed_huffman_code,
+    get_serialized_code_lengths, get_code_lengths_from_serialized,
+    get_varint, read_varint
+)
+
+
+CONTAINER_MAGIC = b'HUFC'
+INDEX_MAGIC = b'HUFI'
+CONTAINER_VERSION = 1
+CONTAINER_BLOCK_SIZE = 1 << 16
+
+# Footer is offset of block index (8 bytes) and index magic
+FOOTER_LENGTH = 8 + len(INDEX_MAGIC)
+
+BINARY_CODE_FOR_POLYNOMIAL = get_binary_code_for_polynomial(POLYNOMIAL)
+
+
+def get_huffman_code_container(message, block_size=CONTAINER_BLOCK_SIZE):
+    """Get container with Huffman code for message
+
+    Container is header (magic, version, flag for text (1) or bytes (0),
+    block size and serialized code lengths), blocks of packed code that
+    start from whole bytes, block index and footer. Index has for every
+    block: offset, length of packed code, length of code in bits, start
+    and length of message block and CRC of packed code.
+    """
+
+    symbols_with_code_length = get_symbols_with_code_length_by_frequency(
+        get_symbols_with_frequency(message)
+    )
+    symbols_with_code = get_canonical_symbols_with_code(
+        symbols_with_code_length
+    )
+
+    container = bytearray(CONTAINER_MAGIC)
+    container.append(CONTAINER_VERSION)
+    container.append(isinstance(message, str))
+    container += get_varint(block_size)
+    container += get_serialized_code_lengths(symbols_with_code_length)
+
+    block_index = []
+
+    for block_start in range(0, len(message), block_size):
+        message_block = message[block_start:block_start + block_size]
+        packed_code, bit_length = get_packed_huffman_code(
+            symbols_with_code, message_block
+        )
+
+        block_index.append((
+            len(container), len(packed_code), bit_length, block_start,
+            len(message_block),
+            get_crc_for_bytes(packed_code, BINARY_CODE_FOR_POLYNOMIAL)
+        ))
+        container += packed_code
+
+    index_offset = len(container)
+    container += get_varint(len(block_index))
+
+    for block_info in block_index:
+        for number in block_info:
+            container += get_varint(number)
+
+    container += index_offset.to_bytes(8, 'big') + INDEX_MAGIC
+
+    return bytes(container)
+
+
+def read_huffman_code_container(container):
+    """Read header and block index of container
+
+    Returns decoding tables, flag for text and block index.
+    """
+
+    if container[:len(CONTAINER_MAGIC)] != CONTAINER_MAGIC or \
+            container[-len(INDEX_MAGIC):] != INDEX_MAGIC:
+        raise ValueError('It is not a Huffman code container')
+
+    position = len(CONTAINER_MAGIC)
+
+    if container[position] != CONTAINER_VERSION:
+        raise ValueError(f'Unknown container version {container[position]}')
+
+    are_characters = container[position + 1] == 1
+    _, position = read_varint(container, position + 2)
+    symbols_with_code_length, _ = get_code_lengths_from_serialized(
+        container, position, are_characters
+    )
+    decoding_tables = get_decoding_tables(
+        get_canonical_symbols_with_code(symbols_with_code_length)
+    )
+
+    position = int.from_bytes(
+        container[-FOOTER_LENGTH:-len(INDEX_MAGIC)], 'big'
+    )
+    blocks_amount, position = read_varint(container, position)
+    block_index = []
+
+    for _ in range(blocks_amount):
+        block_info = []
+
+        for _ in range(6):
+            number, position = read_varint(container, position)
+            block_info.append(number)
+
+        block_index.append(tuple(block_info))
+
+    return decoding_tables, are_characters, block_index
+
+
+def get_message_block_from_container(
+        container, decoding_tables, are_characters, block_info):
+    """Get message block from container checking its CRC"""
+
+    offset, packed_code_length, bit_length, _, _, crc = block_info
+    packed_code = container[offset:offset + packed_code_length]
+
+    if get_crc_for_bytes(packed_code, BINARY_CODE_FOR_POLYNOMIAL) != crc:
+        raise ValueError(f'Wrong CRC for block at offset {offset}')
+
+    symbols = get_symbols_from_packed_huffman_code(
+        decoding_tables, packed_code, bit_length
+    )
+
+    return ''.join(symbols) if are_characters else bytes(symbols)
+
+
+def get_message_slice_from_container(container, start, stop=None):
+    """Get message[start:stop] decoding only blocks that contain it
+
+    Negative indexes are counted from the message end by its length from
+    block index.
+    """
+
+    decoding_tables, are_characters, block_index = \
+        read_huffman_code_container(container)
+    block_starts = [block_info[3] for block_info in block_index]
+    message_blocks = []
+    start, stop, _ = slice(start, stop).indices(
+        sum(block_info[4] for block_info in block_index)
+    )
+
+    for block_info in block_index[
+            max(bisect_right(block_starts, start) - 1, 0):
+            bisect_right(block_starts, stop - 1)]:
+        block_start = block_info[3]
+        message_block = get_message_block_from_container(
+            container, decoding_tables, are_characters, block_info
+        )
+        message_blocks.append(message_block[
+            max(start - block_start, 0):stop - block_start
+        ])
+
+    return ('' if are_characters else b'').join(message_blocks)
+
+
+def get_message_from_container(container):
+    """Get the whole message from container"""
+
+    return get_message_slice_from_container(container, 0)
@@ -0,0 +1,152 @@
+"""Compress and decompress files with Huffman code through mmap"""
+
+from mmap import mmap, ACCESS_READ, ACCESS_WRITE
+from os.path import getsize
+
+from huffman import (
+    get_file_symbols_with_frequency, get_symbols_with_code_length_by_frequency,
+    get_canonical_symbols_with_code, get_symbols_with_code_value,
+    get_decoding_tables, get_serialized_code_lengths,
+    get_code_lengths_from_serialized, get_varint, read_varint,
+    pack_huffman_code, flush_bit_buffer, unpack_huffman_code
+)
+
+
+HUFFMAN_FILE_MAGIC = b'HUFF'
+FILE_CHUNK_SIZE = 1 << 16
+
+
+def compress_file(input_path, output_path, chunk_size=FILE_CHUNK_SIZE):
+    """Compress file with Huffman code
+
+    Input file is memory-mapped and read by chunks, so its bytes are never
+    copied to one Python object. Size of output file is known from symbols
+    frequency, so it's allocated at once and memory-mapped too. Output file
+    is magic, varint with input size, serialized code lengths, varint with
+    length of code in bits and packed code.
+    """
+
+    input_size = getsize(input_path)
+    symbols_with_frequency = get_file_symbols_with_frequency(input_path)
+    symbols_with_code_length = get_symbols_with_code_length_by_frequency(
+        symbols_with_frequency
+    )
+    symbols_with_code_value = get_symbols_with_code_value(
+        get_canonical_symbols_with_code(symbols_with_code_length)
+    )
+    bit_length = sum(
+        frequency * symbols_with_code_length[symbol]
+        for symbol, frequency in symbols_with_frequency.items()
+    )
+
+    header = HUFFMAN_FILE_MAGIC + get_varint(input_size) + \
+        get_serialized_code_lengths(symbols_with_code_length) + \
+        get_varint(bit_length)
+    output_size = len(header) + (bit_length + 7) // 8
+
+    with open(output_path, 'w+b') as output_file:
+        output_file.truncate(output_size)
+
+        with mmap(output_file.fileno(), output_size,
+                  access=ACCESS_WRITE) as output_map:
+            output_map[:len(header)] = header
+            output_position = len(header)
+
+            for packed_code in get_packed_file_chunks(
+                    input_path, symbols_with_code_value, chunk_size):
+                output_map[
+                    output_position:output_position + len(packed_code)
+                ] = packed_code
+                output_position += len(packed_code)
+
+            output_map.flush()
+
+
+def get_packed_file_chunks(input_path, symbols_with_code_value, chunk_size):
+    """Get packed Huffman code for memory-mapped file by chunks"""
+
+    if getsize(input_path) == 0:
+        return
+
+    bit_buffer = [0, 0]
+
+    with open(input_path, 'rb') as input_file, \
+            mmap(input_file.fileno(), 0, access=ACCESS_READ) as input_map, \
+            memoryview(input_map) as input_data:
+        for chunk_start in range(0, len(input_data), chunk_size):
+            packed_code = bytearray()
+
+            with input_data[chunk_start:chunk_start + chunk_size] as chunk:
+                pack_huffman_code(
+                    symbols_with_code_value, chunk, bit_buffer, packed_code
+                )
+
+            yield packed_code
+
+    packed_code = bytearray()
+    flush_bit_buffer(bit_buffer, packed_code)
+
+    yield packed_code
+
+
+def decompress_file(input_path, output_path, chunk_size=FILE_CHUNK_SIZE):
+    """Decompress file from compress_file
+
+    Size of output file is in the header, so it's allocated at once and
+    memory-mapped.
+    """
+
+    with open(input_path, 'rb') as input_file, \
+            mmap(input_file.fileno(), 0, access=ACCESS_READ) as input_map:
+        if input_map[:len(HUFFMAN_FILE_MAGIC)] != HUFFMAN_FILE_MAGIC:
+            raise ValueError('It is not a file with Huffman code')
+
+        output_size, position = read_varint(
+            input_map, len(HUFFMAN_FILE_MAGIC)
+        )
+        symbols_with_code_length, position = \
+            get_code_lengths_from_serialized(input_map, position, False)
+        bit_length, position = read_varint(input_map, position)
+        decoding_tables = get_decoding_tables(
+            get_canonical_symbols_with_code(symbols_with_code_length)
+        )
+
+        with open(output_path, 'w+b') as output_file:
+            output_file.truncate(output_size)
+
+            if output_size == 0:
+                return
+
+            with mmap(output_file.fileno(), output_size,
+                      access=ACCESS_WRITE) as output_map, \
+                    memoryview(input_map) as input_data:
+                write_unpacked_file_chunks(
+                    decoding_tables, input_data[position:], bit_length,
+                    output_map, chunk_size
+                )
+                output_map.flush()
+
+
+def write_unpacked_file_chunks(
+        decoding_tables, packed_code, bit_length, output_map, chunk_size):
+    """Write bytes decoded from packed code by chunks to memory map"""
+
+    unpacking_state = [0, 0, bit_length]
+    output_position = 0
+
+    with packed_code:
+        for chunk_start in range(0, len(packed_code), chunk_size):
+            symbols = []
+
+            with packed_code[chunk_start:chunk_start + chunk_size] as chunk:
+                unpack_huffman_code(
+                    decoding_tables, chunk, unpacking_state, symbols
+                )
+
+            output_map[
+                output_position:output_position + len(symbols)
+            ] = bytes(symbols)
+            output_position += len(symbols)
+
+    if unpacking_state[2] > 0:
+        raise ValueError('Packed Huffman code ended too early')
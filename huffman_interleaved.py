@@ -0,0 +1,83 @@
+"""Calculate Huffman code for message split to interleaved streams"""
+
+from huffman import (
+    get_packed_huffman_code, get_symbols_from_packed_huffman_code,
+    get_varint, read_varint
+)
+from huffman_blocks import get_mapped_in_process_pool
+
+
+STREAMS_AMOUNT = 4
+
+
+def get_interleaved_huffman_code(
+        symbols_with_code, message, streams_amount=STREAMS_AMOUNT):
+    """Get Huffman code for message with symbols in interleaved streams
+
+    Symbol with index i goes to stream i % streams_amount, so streams can
+    be decoded independently. Code is varint with amount of streams, jump
+    table with varint length in bits of every stream and packed streams
+    that start from whole bytes.
+    """
+
+    packed_streams = [
+        get_packed_huffman_code(
+            symbols_with_code, message[stream_index::streams_amount]
+        )
+        for stream_index in range(streams_amount)
+    ]
+    interleaved_code = bytearray(get_varint(streams_amount))
+
+    for _, bit_length in packed_streams:
+        interleaved_code += get_varint(bit_length)
+
+    for packed_code, _ in packed_streams:
+        interleaved_code += packed_code
+
+    return bytes(interleaved_code)
+
+
+def get_packed_streams(interleaved_code):
+    """Get packed code and its length in bits for every stream"""
+
+    streams_amount, position = read_varint(interleaved_code, 0)
+    bit_lengths = []
+
+    for _ in range(streams_amount):
+        bit_length, position = read_varint(interleaved_code, position)
+        bit_lengths.append(bit_length)
+
+    packed_streams = []
+
+    for bit_length in bit_lengths:
+        packed_code_length = (bit_length + 7) // 8
+        packed_streams.append((
+            interleaved_code[position:position + packed_code_length],
+            bit_length
+        ))
+        position += packed_code_length
+
+    return packed_streams
+
+
+def get_message_from_interleaved_huffman_code(
+        decoding_tables, interleaved_code, are_characters=True, processes=1):
+    """Get message from Huffman code with interleaved streams
+
+    Streams are decoded in process pool if processes isn't 1.
+    """
+
+    packed_streams = get_packed_streams(interleaved_code)
+    streams_amount = len(packed_streams)
+    stream_symbols = get_mapped_in_process_pool(
+        get_symbols_from_packed_huffman_code, processes,
+        [decoding_tables] * streams_amount,
+        [packed_code for packed_code, _ in packed_streams],
+        [bit_length for _, bit_length in packed_streams]
+    )
+    symbols = [None] * sum(map(len, stream_symbols))
+
+    for stream_index, symbols_of_stream in enumerate(stream_symbols):
+        symbols[stream_index::streams_amount] = symbols_of_stream
+
+    return ''.join(symbols) if are_characters else bytes(symbols)
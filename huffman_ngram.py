@@ -0,0 +1,117 @@
+"""Calculate Huffman code for n-grams (extended alphabet) of message"""
+
+from collections import Counter
+
+from huffman import (
+    get_symbols_with_frequency, get_huffman_code_tree_by_heap,
+    get_symbols_with_code, get_packed_huffman_code,
+    get_decoding_tables, get_symbols_from_packed_huffman_code
+)
+
+
+NGRAM_LENGTH = 2
+MAX_NGRAM_ALPHABET_SIZE = 1 << 12
+
+# N-grams that occur less often are coded by single symbols
+MIN_NGRAM_FREQUENCY = 2
+
+
+def get_ngrams(message, ngram_length):
+    """Get n-grams of message without the last incomplete n-gram"""
+
+    return [
+        message[ngram_start:ngram_start + ngram_length]
+        for ngram_start
+        in range(0, len(message) - ngram_length + 1, ngram_length)
+    ]
+
+
+def get_ngram_alphabet(
+        message, ngram_length=NGRAM_LENGTH,
+        max_alphabet_size=MAX_NGRAM_ALPHABET_SIZE):
+    """Get set of the most frequent n-grams of message
+
+    Alphabet has place for all single symbols of message, so n-grams and
+    single symbols together are not more than max_alphabet_size.
+    """
+
+    ngrams_amount = max_alphabet_size - len(
+        get_symbols_with_frequency(message)
+    )
+
+    if ngrams_amount <= 0 or ngram_length < 2:
+        return set()
+
+    return {
+        ngram
+        for ngram, frequency
+        in Counter(get_ngrams(message, ngram_length)).most_common(
+            ngrams_amount
+        )
+        if frequency >= MIN_NGRAM_FREQUENCY
+    }
+
+
+def get_ngram_symbols(message, ngram_length, ngram_alphabet):
+    """Get symbols of message: n-grams from alphabet and single symbols
+
+    Single symbols are strings or bytes of length 1, like n-grams.
+    """
+
+    ngram_symbols = []
+    rest_start = len(message) - len(message) % ngram_length
+
+    for ngram_start in range(0, rest_start, ngram_length):
+        ngram = message[ngram_start:ngram_start + ngram_length]
+
+        if ngram in ngram_alphabet:
+            ngram_symbols.append(ngram)
+        else:
+            ngram_symbols += get_single_symbols(ngram)
+
+    ngram_symbols += get_single_symbols(message[rest_start:])
+
+    return ngram_symbols
+
+
+def get_single_symbols(message):
+    """Get single symbols of message as strings or bytes of length 1"""
+
+    return [message[index:index + 1] for index in range(len(message))]
+
+
+def get_ngram_huffman_code(
+        message, ngram_length=NGRAM_LENGTH,
+        max_alphabet_size=MAX_NGRAM_ALPHABET_SIZE):
+    """Get code for n-gram symbols, packed code and its length
+
+    Code isn't canonical because n-grams have no symbol index. Average
+    length of code in bits per symbol of message is given by
+    get_average_length_of_code_message with message_length=len(message).
+    """
+
+    ngram_symbols = get_ngram_symbols(
+        message, ngram_length,
+        get_ngram_alphabet(message, ngram_length, max_alphabet_size)
+    )
+    code_tree = get_huffman_code_tree_by_heap(
+        get_symbols_with_frequency(ngram_symbols)
+    )
+    symbols_with_code = get_symbols_with_code(*code_tree, {}) \
+        if code_tree else {}
+    packed_code, bit_length = get_packed_huffman_code(
+        symbols_with_code, ngram_symbols
+    )
+
+    return symbols_with_code, packed_code, bit_length
+
+
+def get_message_from_ngram_huffman_code(
+        symbols_with_code, packed_code, bit_length, are_characters=True):
+    """Get message from packed code for n-gram symbols"""
+
+    ngram_symbols = get_symbols_from_packed_huffman_code(
+        get_decoding_tables(symbols_with_code), packed_code, bit_length
+    )
+
+    return ('' if are_characters else b'').join(ngram_symbols)
@@ -0,0 +1,165 @@
+"""Static Huffman models trained once on corpus and saved to file"""
+
+from huffman import (
+    get_symbols_with_frequency, get_merged_symbols_with_frequency,
+    get_symbols_with_code_length_by_frequency, get_canonical_symbols_with_code,
+    get_symbols_with_code_value, get_decoding_tables,
+    get_symbols_from_packed_huffman_code, get_serialized_code_lengths,
+    get_code_lengths_from_serialized, get_varint, read_varint,
+    pack_huffman_code, flush_bit_buffer, get_symbol_index, get_symbol
+)
+
+
+STATIC_MODEL_MAGIC = b'HUFS'
+STATIC_MODEL_VERSION = 1
+
+# Symbol for symbols that aren't in the model. Its index is less than index
+# of any symbol, so it's the first symbol with its code length.
+ESCAPE_SYMBOL = -1
+ESCAPE_FREQUENCY = 1
+
+
+class StaticHuffmanModel:
+    """Canonical Huffman code that is shared by many messages
+
+    Encoded message has no code table: it's varint with length of code in
+    bits, packed code and varints with indexes of escaped symbols. Symbol
+    that isn't in the model is coded as escape symbol.
+    """
+
+    __slots__ = (
+        'are_characters', 'symbols_with_code_length',
+        'symbols_with_code_value', 'decoding_tables'
+    )
+
+    def __init__(self, symbols_with_code_length, are_characters=True):
+        self.are_characters = are_characters
+        self.symbols_with_code_length = symbols_with_code_length
+
+        symbols_with_code = get_canonical_symbols_with_code(
+            symbols_with_code_length
+        )
+        self.symbols_with_code_value = get_symbols_with_code_value(
+            symbols_with_code
+        )
+        self.decoding_tables = get_decoding_tables(symbols_with_code)
+
+    @classmethod
+    def from_samples(
+            cls, samples, are_characters=True,
+            escape_frequency=ESCAPE_FREQUENCY):
+        """Get model trained on frequency of symbols in all samples"""
+
+        symbols_with_frequency = get_merged_symbols_with_frequency(
+            get_symbols_with_frequency(sample) for sample in samples
+        )
+        symbols_with_frequency[ESCAPE_SYMBOL] = escape_frequency
+
+        return cls(
+            get_symbols_with_code_length_by_frequency(symbols_with_frequency),
+            are_characters
+        )
+
+    @classmethod
+    def from_serialized(cls, serialized_model):
+        """Get model from bytes of get_serialized"""
+
+        if serialized_model[:len(STATIC_MODEL_MAGIC)] != STATIC_MODEL_MAGIC:
+            raise ValueError('It is not a static Huffman model')
+
+        position = len(STATIC_MODEL_MAGIC)
+
+        if serialized_model[position] != STATIC_MODEL_VERSION:
+            raise ValueError(
+                f'Unknown static model version {serialized_model[position]}'
+            )
+
+        are_characters = serialized_model[position + 1] == 1
+        escape_code_length = serialized_model[position + 2]
+        symbols_with_code_length, _ = get_code_lengths_from_serialized(
+            serialized_model, position + 3, are_characters
+        )
+        symbols_with_code_length[ESCAPE_SYMBOL] = escape_code_length
+
+        return cls(symbols_with_code_length, are_characters)
+
+    @classmethod
+    def load(cls, file_path):
+        """Load model from file"""
+
+        with open(file_path, 'rb') as model_file:
+            return cls.from_serialized(model_file.read())
+
+    def get_serialized(self):
+        """Get bytes with model
+
+        Bytes are magic, version, flag for text (1) or bytes (0), code length
+        of escape symbol and serialized code lengths of other symbols.
+        """
+
+        symbols_with_code_length = dict(self.symbols_with_code_length)
+        escape_code_length = symbols_with_code_length.pop(ESCAPE_SYMBOL)
+
+        return STATIC_MODEL_MAGIC + bytes((
+            STATIC_MODEL_VERSION, self.are_characters, escape_code_length
+        )) + get_serialized_code_lengths(symbols_with_code_length)
+
+    def save(self, file_path):
+        """Save model to file"""
+
+        with open(file_path, 'wb') as model_file:
+            model_file.write(self.get_serialized())
+
+    def encode(self, message):
+        """Get encoded message"""
+
+        symbols_with_code_value = self.symbols_with_code_value
+        escaped_symbols = set(message).difference(symbols_with_code_value)
+
+        if escaped_symbols:
+            escape_code_value = symbols_with_code_value[ESCAPE_SYMBOL]
+            symbols_with_code_value = dict(symbols_with_code_value)
+
+            for symbol in escaped_symbols:
+                symbols_with_code_value[symbol] = escape_code_value
+
+        packed_code = bytearray()
+        bit_buffer = [0, 0]
+
+        bit_length = pack_huffman_code(
+            symbols_with_code_value, message, bit_buffer, packed_code
+        )
+        flush_bit_buffer(bit_buffer, packed_code)
+
+        encoded_message = bytearray(get_varint(bit_length))
+        encoded_message += packed_code
+
+        if escaped_symbols:
+            for symbol in message:
+                if symbol in escaped_symbols:
+                    encoded_message += get_varint(get_symbol_index(symbol))
+
+        return bytes(encoded_message)
+
+    def decode(self, encoded_message):
+        """Get message from encode"""
+
+        bit_length, position = read_varint(encoded_message, 0)
+        packed_code_end = position + (bit_length + 7) // 8
+        symbols = get_symbols_from_packed_huffman_code(
+            self.decoding_tables, encoded_message[position:packed_code_end],
+            bit_length
+        )
+        position = packed_code_end
+
+        if position < len(encoded_message):
+            for index, symbol in enumerate(symbols):
+                if symbol == ESCAPE_SYMBOL:
+                    symbol_index, position = read_varint(
+                        encoded_message, position
+                    )
+                    symbols[index] = get_symbol(
+                        symbol_index, self.are_characters
+                    )
+
+        return ''.join(symbols) if self.are_characters else bytes(symbols)
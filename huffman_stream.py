@@ -0,0 +1,173 @@
+"""Calculate Huffman code for streams by chunks"""
+
+from huffman import (
+    get_symbols_with_frequency, get_merged_symbols_with_frequency,
+    get_symbols_with_code_length_by_frequency,
+    get_canonical_symbols_with_code, get_symbols_with_code_value,
+    get_decoding_tables, get_serialized_code_lengths,
+    get_code_lengths_from_serialized, get_varint, read_varint,
+    pack_huffman_code, flush_bit_buffer, unpack_huffman_code
+)
+
+
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+def read_chunks(stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Read chunks from stream until it ends"""
+
+    while True:
+        chunk = stream.read(chunk_size)
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def get_symbols_with_frequency_from_stream(
+        stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Get frequency for symbols in the stream"""
+
+    return get_merged_symbols_with_frequency(
+        get_symbols_with_frequency(chunk)
+        for chunk in read_chunks(stream, chunk_size)
+    )
+
+
+def write_packed_huffman_code_to_stream(
+        symbols_with_code, input_stream, output_stream,
+        chunk_size=STREAM_CHUNK_SIZE):
+    """Write packed Huffman code for input stream to output stream
+
+    Returns length of the code in bits. The last byte is padded with zero
+    bits like in get_packed_huffman_code.
+    """
+
+    symbols_with_code_value = get_symbols_with_code_value(symbols_with_code)
+    bit_buffer = [0, 0]
+    bit_length = 0
+
+    for chunk in read_chunks(input_stream, chunk_size):
+        packed_code = bytearray()
+        bit_length += pack_huffman_code(
+            symbols_with_code_value, chunk, bit_buffer, packed_code
+        )
+        output_stream.write(packed_code)
+
+    packed_code = bytearray()
+    flush_bit_buffer(bit_buffer, packed_code)
+    output_stream.write(packed_code)
+
+    return bit_length
+
+
+def write_message_from_packed_huffman_code_to_stream(
+        decoding_tables, input_stream, output_stream, bit_length,
+        chunk_size=STREAM_CHUNK_SIZE):
+    """Write message decoded from packed Huffman code in input stream
+
+    Bits of a symbol that is split between chunks are kept in unpacking
+    state until the next chunk is read.
+    """
+
+    unpacking_state = [0, 0, bit_length]
+
+    for packed_code in read_chunks(input_stream, chunk_size):
+        symbols = []
+        unpack_huffman_code(
+            decoding_tables, packed_code, unpacking_state, symbols
+        )
+
+        if symbols:
+            output_stream.write(get_chunk_from_symbols(symbols))
+
+    if unpacking_state[2] > 0:
+        raise ValueError('Packed Huffman code ended too early')
+
+
+def read_varint_from_stream(stream):
+    """Read number in LEB128 varint format from binary stream"""
+
+    number = 0
+    shift = 0
+
+    while True:
+        byte = stream.read(1)
+
+        if not byte:
+            raise ValueError('Stream ended inside varint')
+
+        number |= (byte[0] & 0x7F) << shift
+        shift += 7
+
+        if byte[0] < 0x80:
+            return number
+
+
+def get_chunk_from_symbols(symbols):
+    """Get string from characters or bytes from integer symbols"""
+
+    if isinstance(symbols[0], str):
+        return ''.join(symbols)
+
+    return bytes(symbols)
+
+
+def write_huffman_code_for_stream(
+        input_stream, output_stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Write header with canonical code and Huffman code for stream
+
+    Input stream is read twice: to count frequency of symbols and to encode
+    them, so it must be seekable. Header is varint with header length,
+    flag for text (1) or bytes (0), serialized code lengths and varint with
+    length of code in bits.
+    """
+
+    start_position = input_stream.tell()
+    first_chunk = input_stream.read(1)
+    input_stream.seek(start_position)
+
+    symbols_with_frequency = get_symbols_with_frequency_from_stream(
+        input_stream, chunk_size
+    )
+    symbols_with_code_length = get_symbols_with_code_length_by_frequency(
+        symbols_with_frequency
+    )
+    symbols_with_code = get_canonical_symbols_with_code(
+        symbols_with_code_length
+    )
+    bit_length = sum(
+        frequency * symbols_with_code_length[symbol]
+        for symbol, frequency in symbols_with_frequency.items()
+    )
+
+    header = bytes([isinstance(first_chunk, str)]) + \
+        get_serialized_code_lengths(symbols_with_code_length) + \
+        get_varint(bit_length)
+    output_stream.write(get_varint(len(header)) + header)
+
+    input_stream.seek(start_position)
+
+    write_packed_huffman_code_to_stream(
+        symbols_with_code, input_stream, output_stream, chunk_size
+    )
+
+
+def write_message_for_huffman_code_stream(
+        input_stream, output_stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Write message for stream from write_huffman_code_for_stream"""
+
+    header = input_stream.read(read_varint_from_stream(input_stream))
+    symbols_with_code_length, position = get_code_lengths_from_serialized(
+        header, 1, header[0] == 1
+    )
+    bit_length, _ = read_varint(header, position)
+
+    decoding_tables = get_decoding_tables(
+        get_canonical_symbols_with_code(symbols_with_code_length)
+    )
+
+    write_message_from_packed_huffman_code_to_stream(
+        decoding_tables, input_stream, output_stream, bit_length, chunk_size
+    )
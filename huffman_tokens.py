@@ -0,0 +1,223 @@
+"""Calculate Huffman code for integer tokens with dense tables
+
+Frequency, code length and code value of token are in arrays indexed by
+token id, so large alphabets don't need dict with item for every token.
+"""
+
+from array import array
+
+from huffman import (
+    numpy, NUMPY_MIN_MESSAGE_LENGTH, MAX_NUMPY_CODE_LENGTH,
+    get_packed_huffman_code_for_symbol_indexes, pack_huffman_code,
+    flush_bit_buffer, get_decoding_tables_for_codes,
+    get_symbols_from_packed_huffman_code,
+    get_serialized_code_lengths_by_symbol_index,
+    get_code_lengths_by_symbol_index_from_serialized, get_varint, read_varint
+)
+
+
+def get_token_frequencies(tokens):
+    """Get array with frequency for every token id up to the max one"""
+
+    if len(tokens) == 0:
+        return array('Q')
+
+    if numpy is not None:
+        return numpy.bincount(numpy.asarray(tokens))
+
+    token_frequencies = array('Q', bytes(8 * (max(tokens) + 1)))
+
+    for token in tokens:
+        token_frequencies[token] += 1
+
+    return token_frequencies
+
+
+def get_token_code_lengths(token_frequencies):
+    """Get array with length of Huffman code for every token id
+
+    Tokens that don't occur have code length 0.
+    """
+
+    token_frequencies = token_frequencies.tolist()
+    tokens = sorted(
+        (token for token, frequency in enumerate(token_frequencies)
+         if frequency != 0),
+        key=token_frequencies.__getitem__
+    )
+    token_code_lengths = array('B', bytes(len(token_frequencies)))
+
+    if len(tokens) < 2:
+        for token in tokens:
+            token_code_lengths[token] = 1
+
+        return token_code_lengths
+
+    for token, code_length in zip(tokens, get_code_lengths_by_sorted_frequency(
+            [token_frequencies[token] for token in tokens])):
+        token_code_lengths[token] = code_length
+
+    return token_code_lengths
+
+
+def get_code_lengths_by_sorted_frequency(frequencies):
+    """Get code lengths by frequencies sorted in ascending order
+
+    Code lengths are calculated in place of frequencies without tree
+    (algorithm of Moffat and Katajainen): at first list gets weights of
+    internal nodes and indexes of their parents, then their depths and
+    then depths of leaves. Needs at least 2 frequencies.
+    """
+
+    frequencies_amount = len(frequencies)
+    frequencies[0] += frequencies[1]
+    root = 0
+    leaf = 2
+
+    for node in range(1, frequencies_amount - 1):
+        for is_first_child in (True, False):
+            if leaf >= frequencies_amount or (
+                    root < node and frequencies[root] < frequencies[leaf]):
+                child_frequency = frequencies[root]
+                frequencies[root] = node
+                root += 1
+            else:
+                child_frequency = frequencies[leaf]
+                leaf += 1
+
+            if is_first_child:
+                frequencies[node] = child_frequency
+            else:
+                frequencies[node] += child_frequency
+
+    frequencies[frequencies_amount - 2] = 0
+
+    for node in range(frequencies_amount - 3, -1, -1):
+        frequencies[node] = frequencies[frequencies[node]] + 1
+
+    available_nodes = 1
+    depth = 0
+    root = frequencies_amount - 2
+    leaf = frequencies_amount - 1
+
+    while available_nodes > 0:
+        used_nodes = 0
+
+        while root >= 0 and frequencies[root] == depth:
+            used_nodes += 1
+            root -= 1
+
+        while available_nodes > used_nodes:
+            frequencies[leaf] = depth
+            leaf -= 1
+            available_nodes -= 1
+
+        available_nodes = 2 * used_nodes
+        depth += 1
+
+    return frequencies
+
+
+def get_token_code_values(token_code_lengths):
+    """Get canonical code value for every token id by code lengths
+
+    Values are in array of 64-bit numbers or in list if codes are longer.
+    """
+
+    max_code_length = max(token_code_lengths, default=0)
+    code_lengths_amounts = [0] * (max_code_length + 1)
+
+    for code_length in token_code_lengths:
+        code_lengths_amounts[code_length] += 1
+
+    # The first code value for every code length like in DEFLATE
+    next_code_values = [0] * (max_code_length + 1)
+    code_value = 0
+    code_lengths_amounts[0] = 0
+
+    for code_length in range(1, max_code_length + 1):
+        code_value = (code_value + code_lengths_amounts[code_length - 1]) << 1
+        next_code_values[code_length] = code_value
+
+    token_code_values = array('Q', bytes(8 * len(token_code_lengths))) \
+        if max_code_length <= 64 else [0] * len(token_code_lengths)
+
+    for token, code_length in enumerate(token_code_lengths):
+        if code_length != 0:
+            token_code_values[token] = next_code_values[code_length]
+            next_code_values[code_length] += 1
+
+    return token_code_values
+
+
+def get_packed_token_code(token_code_values, token_code_lengths, tokens):
+    """Get Huffman code for tokens packed to bytes and its length in bits"""
+
+    if numpy is not None and len(tokens) >= NUMPY_MIN_MESSAGE_LENGTH and \
+            max(token_code_lengths) <= MAX_NUMPY_CODE_LENGTH:
+        return get_packed_huffman_code_for_symbol_indexes(
+            numpy.frombuffer(token_code_values, numpy.uint64),
+            numpy.frombuffer(token_code_lengths, numpy.uint8),
+            numpy.asarray(tokens)
+        )
+
+    packed_code = bytearray()
+    bit_buffer = [0, 0]
+
+    # List of (code value, code length) is indexed by token like dict
+    bit_length = pack_huffman_code(
+        list(zip(token_code_values, token_code_lengths)), tokens,
+        bit_buffer, packed_code
+    )
+    flush_bit_buffer(bit_buffer, packed_code)
+
+    return bytes(packed_code), bit_length
+
+
+def get_tokens_from_packed_token_code(
+        token_code_values, token_code_lengths, packed_code, bit_length):
+    """Get array with tokens from packed Huffman code"""
+
+    decoding_tables = get_decoding_tables_for_codes([
+        (token_code_values[token], code_length, token)
+        for token, code_length in enumerate(token_code_lengths)
+        if code_length != 0
+    ])
+
+    return array(
+        'I' if len(token_code_lengths) <= 1 << 32 else 'Q',
+        get_symbols_from_packed_huffman_code(
+            decoding_tables, packed_code, bit_length
+        )
+    )
+
+
+def get_token_huffman_code(tokens):
+    """Get Huffman code for tokens with code lengths
+
+    Code is serialized code lengths by token id, varint with length of code
+    in bits and packed code.
+    """
+
+    token_code_lengths = get_token_code_lengths(get_token_frequencies(tokens))
+    packed_code, bit_length = get_packed_token_code(
+        get_token_code_values(token_code_lengths), token_code_lengths, tokens
+    )
+
+    return get_serialized_code_lengths_by_symbol_index(token_code_lengths) + \
+        get_varint(bit_length) + packed_code
+
+
+def get_tokens_from_token_huffman_code(token_huffman_code):
+    """Get array with tokens from get_token_huffman_code"""
+
+    code_lengths, position = get_code_lengths_by_symbol_index_from_serialized(
+        token_huffman_code
+    )
+    token_code_lengths = array('B', code_lengths)
+    bit_length, position = read_varint(token_huffman_code, position)
+
+    return get_tokens_from_packed_token_code(
+        get_token_code_values(token_code_lengths), token_code_lengths,
+        memoryview(token_huffman_code)[position:], bit_length
+    )
@@ -1,4 +1,7 @@
+from argparse import ArgumentParser
+
 from huffman import print_all_info_for_huffman_code
+from huffman_file import compress_file, decompress_file
 from crc import print_all_info_for_crc_code
 
 HUFFMAN_MESSAGE = "Communication systems with over-the-air-programming"
@@ -15,5 +18,33 @@ def print_all_info_for_huffman_code_and_crc():
     print_all_info_for_crc_code(HEX_MESSAGE, POLYNOMIAL)
 
 
+def get_argument_parser():
+    argument_parser = ArgumentParser(
+        description='Compress and decompress files with Huffman code. '
+        'Without command prints info for Huffman code and CRC examples.'
+    )
+    subparsers = argument_parser.add_subparsers(dest='command')
+
+    for command, help_ in (
+            ('compress', 'compress file'),
+            ('decompress', 'decompress file from compress command')):
+        subparser = subparsers.add_parser(command, help=help_)
+        subparser.add_argument('input_path')
+        subparser.add_argument('output_path')
+
+    return argument_parser
+
+
+def main(arguments=None):
+    arguments = get_argument_parser().parse_args(arguments)
+
+    if arguments.command == 'compress':
+        compress_file(arguments.input_path, arguments.output_path)
+    elif arguments.command == 'decompress':
+        decompress_file(arguments.input_path, arguments.output_path)
+    else:
+        print_all_info_for_huffman_code_and_crc()
+
+
 if __name__ == '__main__':
-    print_all_info_for_huffman_code_and_crc()
+    main()
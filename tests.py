@@ -1,9 +1,15 @@
 """Module with unit tests"""
 
+from array import array
+from asyncio import StreamReader, run
+from io import BytesIO, StringIO
+from mmap import mmap
+from os.path import join
 from random import randint
+from tempfile import TemporaryDirectory
 
 from unittest import TestCase
-from unittest.mock import patch, call
+from unittest.mock import AsyncMock, Mock, patch, call
 
 from huffman import (
     get_symbols_with_frequency, get_symbols_with_probability,
@@ -13,7 +19,59 @@ from huffman import (
     print_frequency_and_probability_for_symbols, get_symbols_with_code,
     get_average_length_of_code_message, get_huffman_code,
     print_all_info_for_huffman_code, get_new_node_created_by_first_2_nodes,
-    insert_node, add_node_created_by_first_2_nodes
+    insert_node, add_node_created_by_first_2_nodes,
+    get_huffman_code_tree_by_heap, get_huffman_code_tree_by_two_queues,
+    get_packed_huffman_code, get_huffman_code_from_packed_code,
+    get_decoding_tables, get_message_from_packed_huffman_code,
+    get_symbols_with_code_length, get_canonical_symbols_with_code,
+    get_serialized_code_lengths, get_code_lengths_from_serialized,
+    get_length_limited_symbols_with_code_length,
+    get_average_length_loss_for_max_code_length,
+    get_symbols_with_frequency_in_parallel, get_file_symbols_with_frequency,
+    get_code_table,
+    get_symbols_with_code_from_code_table,
+    get_symbols_with_code_length_by_frequency, HuffmanModel
+)
+from huffman_stream import (
+    get_symbols_with_frequency_from_stream, write_huffman_code_for_stream,
+    write_message_for_huffman_code_stream
+)
+from huffman_blocks import (
+    get_huffman_code_blocks, get_message_from_huffman_code_blocks
+)
+from huffman_cache import CodeTableCache, get_histogram_fingerprint
+from adaptive_huffman import (
+    AdaptiveHuffmanEncoder, AdaptiveHuffmanDecoder, get_adaptive_huffman_code,
+    get_message_from_adaptive_huffman_code
+)
+from huffman_container import (
+    get_huffman_code_container, read_huffman_code_container,
+    get_message_slice_from_container, get_message_from_container
+)
+from huffman_file import compress_file, decompress_file
+from crc import (
+    POLYNOMIAL, CRC_TABLES, get_binary_code_for_polynomial, get_crc_code,
+    get_crc_for_bytes, get_crc_for_bytes_by_slicing,
+    get_crc_for_binary_message, get_crc_table, write_crc_tables_module
+)
+from huffman_static import StaticHuffmanModel
+from huffman_array_tree import ArrayHuffmanCodeTree
+from huffman_tokens import (
+    get_token_frequencies, get_token_code_lengths, get_token_code_values,
+    get_token_huffman_code, get_tokens_from_token_huffman_code
+)
+from huffman_async import (
+    write_huffman_code_frames, write_message_from_huffman_code_frames
+)
+from benchmark import (
+    CORPUS_GENERATORS, get_corpus, get_stage_times, get_regressions
+)
+from huffman_interleaved import (
+    get_interleaved_huffman_code, get_message_from_interleaved_huffman_code
+)
+from huffman_ngram import (
+    get_ngram_alphabet, get_ngram_symbols, get_ngram_huffman_code,
+    get_message_from_ngram_huffman_code
 )
 
 # DATA FOR TESTING
@@ -144,6 +202,76 @@ TEST_SYMBOLS_WITH_CODE = (
     {'a': '0', 'b': '1'}
 )
 
+EXPECTED_CANONICAL_SYMBOLS_WITH_CODE = (
+    {'b': '0', 'e': '10', 'c': '110', 'a': '1110', 'd': '1111'},
+    {
+        'b': '00', 'e': '01', ' ': '100', 'o': '101', 'p': '110',
+        '!': '1110', 'r': '1111'
+    },
+    {
+        'i': '000', 'm': '001', ' ': '0100', '-': '0101', 'a': '0110',
+        'e': '0111', 'n': '1000', 'o': '1001', 'r': '1010', 's': '1011',
+        't': '1100', 'g': '11010', 'h': '11011', 'p': '11100',
+        'C': '111010', 'c': '111011', 'u': '111100', 'v': '111101',
+        'w': '111110', 'y': '111111'
+    },
+    None,
+    {'a': '0', 'b': '1'}
+)
+
+# Data for testing code length limit: (message index, max code length,
+# expected loss of average length of code message)
+TEST_MAX_CODE_LENGTHS_AND_EXPECTED_LOSSES = (
+    (0, 3, 0.05),
+    (0, 4, 0.0),
+    (1, 3, 0.06666),
+    (2, 5, 0.0392),
+    (2, 6, 0.0),
+    (4, 1, 0.0),
+)
+
+TEST_CHUNK_SIZES = (1, 3, 64)
+
+# Long messages are counted with NumPy
+TEST_LONG_MESSAGES = tuple(message * 500 for message in TEST_MESSAGES)
+
+# Binary messages supplemented with 10 zero bits for POLYNOMIAL and CRC codes
+# from division of strings
+TEST_CRC_BINARY_MESSAGES_AND_EXPECTED_CRC_CODES = (
+    ('101001000110011110001111111000010000000000', '1010111110'),
+    ('00000000000000', '000'),
+    ('11111111111111110000000000', '10010000000'),
+    ('00000000000000010000000000', '10000000000'),
+    ('110111101010110110111110111011110000000000', '11000010100'),
+    (
+        '0001001000110100010101100111100010011010101111001101111011110000'
+        '0000000000',
+        '10110101100'
+    ),
+    ('11000110011', ''),
+    ('0000000000111', '111'),
+)
+
+TEST_CRC_POLYNOMIALS = (
+    POLYNOMIAL, 'x ^ 3 + x + 1', 'x ^ 8 + x ^ 2 + x + 1',
+    'x ^ 16 + x ^ 12 + x ^ 5 + 1'
+)
+
+# Polynomials with register larger than byte or slicing block
+TEST_CRC_LONG_POLYNOMIALS = (
+    'x ^ 32 + x ^ 26 + x ^ 23 + x ^ 22 + x ^ 16 + x ^ 12 + x ^ 11 + x ^ 10 + '
+    'x ^ 8 + x ^ 7 + x ^ 5 + x ^ 4 + x ^ 2 + x + 1',
+    'x ^ 64 + x ^ 4 + x ^ 3 + x + 1',
+    'x ^ 100 + x ^ 37 + 1',
+)
+
+# Frequencies where internal nodes of Huffman code tree have the same weight
+TEST_FREQUENCIES_WITH_TIES = (
+    {'a': 2, 'b': 2, 'c': 2, 'd': 3, 'e': 2},
+    {'a': 1, 'b': 1, 'c': 1, 'd': 1, 'e': 2, 'f': 2, 'g': 4},
+    {'a': 0, 'b': 0, 'c': 0, 'd': 1},
+)
+
 # Data for testing is_tree function
 TEST_OBJECTS_TREES = ((1, 2, 3), (1,), ('string1', 'string2'))
 
@@ -356,6 +484,17 @@ TEST_TREE_AND_TREE_AFTER_ADDING_NODES = (
 )
 
 
+def get_symbols_with_code_length_for_tree(code_tree):
+    """Get symbols with length of their code for code tree"""
+
+    if code_tree == [] or not is_tree(code_tree[0]):
+        return {}
+
+    return get_symbols_with_code_length(
+        get_symbols_with_code(*code_tree, {})
+    )
+
+
 class TestHuffmanCode(TestCase):
     """Class with tests for Huffman code"""
 
@@ -373,6 +512,89 @@ class TestHuffmanCode(TestCase):
                     real_message_frequency, expected_message_frequency
                 )
 
+    def test_get_symbols_with_frequency_for_long_messages(self):
+        """Test get_symbols_with_frequency function for long messages"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            message = TEST_LONG_MESSAGES[i]
+            expected_message_frequency = {
+                symbol: frequency * 500
+                for symbol, frequency in TEST_FREQUENCIES[i].items()
+            }
+
+            with self.subTest(f'Message: {TEST_MESSAGES[i]}'):
+                real_message_frequency = get_symbols_with_frequency(message)
+
+                self.assertEqual(
+                    list(real_message_frequency.items()),
+                    list(expected_message_frequency.items())
+                )
+
+            with self.subTest(f'Bytes: {TEST_MESSAGES[i]}'):
+                real_message_frequency = get_symbols_with_frequency(
+                    message.encode()
+                )
+
+                self.assertEqual(
+                    real_message_frequency,
+                    {
+                        ord(symbol): frequency
+                        for symbol, frequency
+                        in expected_message_frequency.items()
+                    }
+                )
+
+    def test_get_symbols_with_frequency_for_byte_buffers(self):
+        """Test get_symbols_with_frequency function for mmap and memoryview"""
+
+        for repeats in (1, 1000):
+            data = b'abca\xffb' * repeats
+            expected_message_frequency = {
+                97: 2 * repeats, 98: 2 * repeats, 99: repeats, 255: repeats
+            }
+
+            with self.subTest(f'mmap, repeats: {repeats}'):
+                message_map = mmap(-1, len(data))
+                message_map.write(data)
+
+                self.assertEqual(
+                    get_symbols_with_frequency(message_map),
+                    expected_message_frequency
+                )
+                message_map.close()
+
+            for view_format in ('B', 'b', 'c'):
+                with self.subTest(
+                        f'memoryview {view_format}, repeats: {repeats}'):
+                    self.assertEqual(
+                        get_symbols_with_frequency(
+                            memoryview(data).cast(view_format)
+                        ),
+                        expected_message_frequency
+                    )
+
+    @patch('huffman.PARALLEL_COUNTING_SLICE_LENGTH', 1000)
+    def test_get_symbols_with_frequency_in_parallel(self):
+        """Test get_symbols_with_frequency_in_parallel function"""
+
+        message = TEST_LONG_MESSAGES[2].encode()
+
+        self.assertEqual(
+            list(get_symbols_with_frequency_in_parallel(message, 2).items()),
+            list(get_symbols_with_frequency(message).items())
+        )
+
+        with TemporaryDirectory() as directory:
+            file_path = join(directory, 'message')
+
+            with open(file_path, 'wb') as message_file:
+                message_file.write(message)
+
+            self.assertEqual(
+                list(get_file_symbols_with_frequency(file_path, 2).items()),
+                list(get_symbols_with_frequency(message).items())
+            )
+
     def test_get_symbols_with_probability(self):
         """Test get_symbols_with_probability function"""
 
@@ -441,6 +663,45 @@ class TestHuffmanCode(TestCase):
 
             self.assertEqual(real_code_tree, expected_code_tree)
 
+    def test_get_huffman_code_tree_by_heap(self):
+        """Test get_huffman_code_tree_by_heap function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            sorted_frequency = get_sorted_symbols_with_frequency(
+                TEST_FREQUENCIES[i], False
+            )
+
+            with self.subTest(f'Sorted frequency: {sorted_frequency}'):
+                expected_code_tree = get_huffman_code_tree(sorted_frequency)
+                real_code_tree = get_huffman_code_tree_by_heap(
+                    TEST_FREQUENCIES[i]
+                )
+
+                self.assertEqual(
+                    get_symbols_with_code_length_for_tree(real_code_tree),
+                    get_symbols_with_code_length_for_tree(expected_code_tree)
+                )
+                self.assertEqual(
+                    get_huffman_code_tree_by_heap(sorted_frequency),
+                    expected_code_tree
+                )
+
+    def test_get_huffman_code_tree_by_two_queues(self):
+        """Test get_huffman_code_tree_by_two_queues function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            sorted_frequency = get_sorted_symbols_with_frequency(
+                TEST_FREQUENCIES[i], False
+            )
+
+            with self.subTest(f'Sorted frequency: {sorted_frequency}'):
+                expected_code_tree = get_huffman_code_tree(sorted_frequency)
+                real_code_tree = get_huffman_code_tree_by_two_queues(
+                    sorted_frequency
+                )
+
+                self.assertEqual(real_code_tree, expected_code_tree)
+
     def test_get_tree_nodes_and_frequency(self):
         """Test get_tree_nodes_and_frequency function"""
 
@@ -526,6 +787,167 @@ class TestHuffmanCode(TestCase):
 
                 self.assertEqual(real_huffman_code, expected_huffman_code)
 
+    def test_get_packed_huffman_code(self):
+        """Test get_packed_huffman_code function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            # Fixture has no code for the empty message
+            if TEST_SYMBOLS_WITH_CODE[i] is None:
+                continue
+
+            message = TEST_MESSAGES[i]
+
+            with self.subTest(f'Message: {message}'):
+                expected_huffman_code = EXPECTED_HUFFMAN_CODES[i]
+                packed_code, bit_length = get_packed_huffman_code(
+                    TEST_SYMBOLS_WITH_CODE[i], message
+                )
+
+                self.assertEqual(bit_length, len(expected_huffman_code))
+                self.assertEqual(len(packed_code), (bit_length + 7) // 8)
+                self.assertEqual(
+                    get_huffman_code_from_packed_code(packed_code, bit_length),
+                    expected_huffman_code
+                )
+
+        self.assertEqual(get_packed_huffman_code({}, ''), (b'', 0))
+
+    def test_get_packed_huffman_code_for_long_messages(self):
+        """Test get_packed_huffman_code function for long messages"""
+
+        for message in TEST_LONG_MESSAGES:
+            symbols_with_code = get_canonical_symbols_with_code(
+                get_symbols_with_code_length_by_frequency(
+                    get_symbols_with_frequency(message)
+                )
+            )
+
+            with self.subTest(f'Message: {message[:60]}'), \
+                    patch('huffman.NUMPY_PACKING_BLOCK_LENGTH', 1000):
+                packed_code, bit_length = get_packed_huffman_code(
+                    symbols_with_code, message
+                )
+
+                self.assertEqual(
+                    get_huffman_code_from_packed_code(packed_code, bit_length),
+                    get_huffman_code(symbols_with_code, message)
+                )
+
+    def test_get_message_from_packed_huffman_code(self):
+        """Test get_message_from_packed_huffman_code function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            # Fixture has no code for the empty message
+            if TEST_SYMBOLS_WITH_CODE[i] is None:
+                continue
+
+            message = TEST_MESSAGES[i]
+
+            for lookup_bits in (1, 2, 10):
+                with self.subTest(
+                        f'Message: {message} *** Bits: {lookup_bits}'):
+                    packed_code, bit_length = get_packed_huffman_code(
+                        TEST_SYMBOLS_WITH_CODE[i], message
+                    )
+                    decoding_tables = get_decoding_tables(
+                        TEST_SYMBOLS_WITH_CODE[i], lookup_bits
+                    )
+
+                    real_message = get_message_from_packed_huffman_code(
+                        decoding_tables, packed_code, bit_length
+                    )
+
+                    self.assertEqual(real_message, message)
+
+        for lookup_bits in (1, 2, 10):
+            with self.subTest(f'Empty message *** Bits: {lookup_bits}'):
+                self.assertEqual(
+                    get_message_from_packed_huffman_code(
+                        get_decoding_tables({}, lookup_bits), b'', 0
+                    ),
+                    ''
+                )
+
+    def test_get_canonical_symbols_with_code(self):
+        """Test get_canonical_symbols_with_code function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            # Fixture has no code for the empty message
+            if TEST_SYMBOLS_WITH_CODE[i] is None:
+                continue
+
+            symbols_with_code_length = get_symbols_with_code_length(
+                TEST_SYMBOLS_WITH_CODE[i]
+            )
+
+            with self.subTest(f'Code lengths: {symbols_with_code_length}'):
+                expected_symbols_with_code = \
+                    EXPECTED_CANONICAL_SYMBOLS_WITH_CODE[i]
+                real_symbols_with_code = get_canonical_symbols_with_code(
+                    symbols_with_code_length
+                )
+
+                self.assertEqual(
+                    real_symbols_with_code, expected_symbols_with_code
+                )
+
+        self.assertEqual(get_canonical_symbols_with_code({}), {})
+
+    def test_get_code_lengths_from_serialized(self):
+        """Test get_code_lengths_from_serialized function"""
+
+        for symbols_with_code in TEST_SYMBOLS_WITH_CODE:
+            symbols_with_code_length = get_symbols_with_code_length(
+                symbols_with_code or {}
+            )
+
+            with self.subTest(f'Code lengths: {symbols_with_code_length}'):
+                serialized_code_lengths = get_serialized_code_lengths(
+                    symbols_with_code_length
+                )
+
+                self.assertEqual(
+                    get_code_lengths_from_serialized(
+                        serialized_code_lengths + b'\x00'
+                    ),
+                    (symbols_with_code_length, len(serialized_code_lengths))
+                )
+
+    def test_get_length_limited_symbols_with_code_length(self):
+        """Test get_length_limited_symbols_with_code_length function"""
+
+        for i, max_code_length, expected_loss in \
+                TEST_MAX_CODE_LENGTHS_AND_EXPECTED_LOSSES:
+            frequency = TEST_FREQUENCIES[i]
+
+            with self.subTest(
+                    f'Frequency: {frequency} *** Max: {max_code_length}'):
+                symbols_with_code_length = \
+                    get_length_limited_symbols_with_code_length(
+                        frequency, max_code_length
+                    )
+                kraft_sum = sum(
+                    2 ** -code_length
+                    for code_length in symbols_with_code_length.values()
+                )
+
+                self.assertEqual(
+                    symbols_with_code_length.keys(), frequency.keys()
+                )
+                self.assertLessEqual(
+                    max(symbols_with_code_length.values()), max_code_length
+                )
+                self.assertEqual(kraft_sum, 1)
+                self.assertEqual(
+                    get_average_length_loss_for_max_code_length(
+                        frequency, max_code_length
+                    ),
+                    expected_loss
+                )
+
+        with self.assertRaises(ValueError):
+            get_length_limited_symbols_with_code_length(TEST_FREQUENCIES[2], 4)
+
     def test_get_symbols_with_code(self):
         """Test get_symbols_with_code function"""
 
@@ -546,6 +968,35 @@ class TestHuffmanCode(TestCase):
                     real_symbols_with_code, expected_symbols_with_code
                 )
 
+    def test_get_code_table(self):
+        """Test get_code_table function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            # Fixture has no code tree for the empty message
+            if TEST_CODE_TREES[i] is None:
+                continue
+
+            message_code_tree = TEST_CODE_TREES[i]
+
+            with self.subTest(f'Message code tree: {message_code_tree}'):
+                code_table = get_code_table(*message_code_tree)
+
+                self.assertEqual(
+                    get_symbols_with_code_from_code_table(code_table),
+                    TEST_SYMBOLS_WITH_CODE[i]
+                )
+
+        deep_code_tree = 'a'
+
+        for symbol in range(5000):
+            deep_code_tree = (symbol, deep_code_tree)
+
+        symbols, code_values, code_lengths = get_code_table(deep_code_tree)
+
+        self.assertEqual(symbols[-1], 'a')
+        self.assertEqual(code_values[-1], 2 ** 5000 - 1)
+        self.assertEqual(max(code_lengths), 5000)
+
     def test_get_new_node_created_by_first_2_nodes(self):
         """Test get_new_node_created_by_first_2_nodes function"""
 
@@ -647,3 +1098,805 @@ class TestHuffmanCode(TestCase):
                 )
 
                 self.assertEqual(mocked_print.mock_calls, expected_calls)
+
+    def test_huffman_model(self):
+        """Test HuffmanModel class"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            # Probabilities of empty message don't sum to 1, it's checked below
+            if not TEST_MESSAGES[i]:
+                continue
+
+            message = TEST_MESSAGES[i]
+
+            with self.subTest(f'Message: {message}'):
+                huffman_model = HuffmanModel.from_message(message)
+
+                self.assertEqual(
+                    huffman_model.symbols_with_frequency, TEST_FREQUENCIES[i]
+                )
+                self.assertEqual(
+                    sum(huffman_model.symbols_with_probability.values()), 1
+                )
+                # Legacy statistics are summed from rounded probabilities
+                self.assertAlmostEqual(
+                    huffman_model.entropy, EXPECTED_ENTROPIES[i], 3
+                )
+                self.assertAlmostEqual(
+                    float(huffman_model.average_length_of_code_message),
+                    EXPECTED_AVERAGE_LENGTHS[i], 3
+                )
+                self.assertGreaterEqual(huffman_model.redundancy, 0)
+                self.assertEqual(
+                    get_huffman_code(huffman_model.symbols_with_code, message),
+                    EXPECTED_HUFFMAN_CODES[i]
+                )
+
+                with patch('huffman.get_symbols_with_code') as mocked_function:
+                    huffman_model.symbols_with_code
+
+                    mocked_function.assert_not_called()
+
+        huffman_model = HuffmanModel.from_message('')
+
+        self.assertEqual(huffman_model.symbols_with_frequency, {})
+        self.assertEqual(huffman_model.symbols_with_probability, {})
+        self.assertEqual(huffman_model.symbols_with_code, {})
+        self.assertEqual(huffman_model.entropy, 0)
+        self.assertEqual(huffman_model.average_length_of_code_message, 0)
+        self.assertEqual(huffman_model.redundancy, 0)
+
+
+class TestHuffmanStream(TestCase):
+    """Class with tests for Huffman code for streams"""
+
+    def test_get_symbols_with_frequency_from_stream(self):
+        """Test get_symbols_with_frequency_from_stream function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            for chunk_size in TEST_CHUNK_SIZES:
+                with self.subTest(
+                        f'Message: {TEST_MESSAGES[i]} *** '
+                        f'Chunk: {chunk_size}'):
+                    real_message_frequency = \
+                        get_symbols_with_frequency_from_stream(
+                            StringIO(TEST_MESSAGES[i]), chunk_size
+                        )
+
+                    self.assertEqual(
+                        real_message_frequency, TEST_FREQUENCIES[i]
+                    )
+
+    def test_write_message_for_huffman_code_stream(self):
+        """Test write_message_for_huffman_code_stream function"""
+
+        for message in TEST_MESSAGES:
+            for chunk_size in TEST_CHUNK_SIZES:
+                with self.subTest(
+                        f'Message: {message} *** Chunk: {chunk_size}'):
+                    huffman_code_stream = BytesIO()
+                    message_stream = StringIO()
+
+                    write_huffman_code_for_stream(
+                        StringIO(message), huffman_code_stream, chunk_size
+                    )
+                    huffman_code_stream.seek(0)
+                    write_message_for_huffman_code_stream(
+                        huffman_code_stream, message_stream, chunk_size
+                    )
+
+                    self.assertEqual(message_stream.getvalue(), message)
+
+                with self.subTest(f'Bytes: {message} *** Chunk: {chunk_size}'):
+                    huffman_code_stream = BytesIO()
+                    message_stream = BytesIO()
+
+                    write_huffman_code_for_stream(
+                        BytesIO(message.encode()), huffman_code_stream,
+                        chunk_size
+                    )
+                    huffman_code_stream.seek(0)
+                    write_message_for_huffman_code_stream(
+                        huffman_code_stream, message_stream, chunk_size
+                    )
+
+                    self.assertEqual(
+                        message_stream.getvalue(), message.encode()
+                    )
+
+
+class TestHuffmanBlocks(TestCase):
+    """Class with tests for Huffman code by blocks"""
+
+    def test_get_message_from_huffman_code_blocks(self):
+        """Test get_message_from_huffman_code_blocks function"""
+
+        for message in TEST_MESSAGES:
+            for block_size in (4, 1000):
+                with self.subTest(
+                        f'Message: {message} *** Block: {block_size}'):
+                    huffman_code_blocks = get_huffman_code_blocks(
+                        message, block_size, processes=1
+                    )
+
+                    self.assertEqual(
+                        get_message_from_huffman_code_blocks(
+                            huffman_code_blocks, processes=1
+                        ),
+                        message
+                    )
+
+        message = TEST_LONG_MESSAGES[2].encode()
+        huffman_code_blocks = get_huffman_code_blocks(message, 5000, 2)
+
+        self.assertEqual(
+            get_message_from_huffman_code_blocks(huffman_code_blocks, 2),
+            message
+        )
+
+
+class TestCodeTableCache(TestCase):
+    """Class with tests for cache of Huffman code tables"""
+
+    def test_get_histogram_fingerprint(self):
+        """Test get_histogram_fingerprint function"""
+
+        doubled_frequency = {
+            symbol: frequency * 2
+            for symbol, frequency in TEST_FREQUENCIES[2].items()
+        }
+
+        self.assertEqual(
+            get_histogram_fingerprint(TEST_FREQUENCIES[2]),
+            get_histogram_fingerprint(TEST_SORTED_FREQUENCIES[2])
+        )
+        self.assertNotEqual(
+            get_histogram_fingerprint(TEST_FREQUENCIES[2]),
+            get_histogram_fingerprint(doubled_frequency)
+        )
+        self.assertEqual(
+            get_histogram_fingerprint(TEST_FREQUENCIES[2], 8),
+            get_histogram_fingerprint(doubled_frequency, 8)
+        )
+
+    def test_get_symbols_with_code(self):
+        """Test get_symbols_with_code method"""
+
+        cache = CodeTableCache(max_size=2)
+
+        for i in (0, 1, 0, 2, 1):
+            symbols_with_code = cache.get_symbols_with_code(
+                TEST_FREQUENCIES[i]
+            )
+
+            self.assertEqual(
+                symbols_with_code,
+                get_canonical_symbols_with_code(
+                    get_symbols_with_code_length_by_frequency(
+                        TEST_FREQUENCIES[i]
+                    )
+                )
+            )
+
+        self.assertEqual(
+            (cache.hits, cache.misses, cache.evictions, len(cache)),
+            (1, 4, 2, 2)
+        )
+
+
+class TestAdaptiveHuffmanCode(TestCase):
+    """Class with tests for adaptive Huffman code"""
+
+    def test_get_message_from_adaptive_huffman_code(self):
+        """Test get_message_from_adaptive_huffman_code function"""
+
+        for message in TEST_MESSAGES + TEST_LONG_MESSAGES[:3]:
+            with self.subTest(f'Message: {message[:60]}'):
+                packed_code, bit_length = get_adaptive_huffman_code(message)
+
+                self.assertEqual(
+                    get_message_from_adaptive_huffman_code(
+                        packed_code, bit_length
+                    ),
+                    message
+                )
+
+            with self.subTest(f'Bytes: {message[:60]}'):
+                packed_code, bit_length = get_adaptive_huffman_code(
+                    message.encode()
+                )
+
+                self.assertEqual(
+                    get_message_from_adaptive_huffman_code(
+                        packed_code, bit_length, False
+                    ),
+                    message.encode()
+                )
+
+    def test_adaptive_huffman_decoder(self):
+        """Test AdaptiveHuffmanDecoder with code split to parts"""
+
+        for message in TEST_MESSAGES:
+            with self.subTest(f'Message: {message}'):
+                encoder = AdaptiveHuffmanEncoder()
+                decoder = AdaptiveHuffmanDecoder()
+                packed_code_parts = [
+                    encoder.encode(message[start:start + 3])
+                    for start in range(0, len(message), 3)
+                ]
+                last_packed_code_part = encoder.flush()
+
+                decoded_message = ''.join(
+                    decoder.decode(packed_code_part)
+                    for packed_code_part in packed_code_parts
+                ) + decoder.decode(last_packed_code_part, encoder.bit_length)
+
+                self.assertEqual(decoded_message, message)
+
+
+class TestHuffmanContainer(TestCase):
+    """Class with tests for container with Huffman code blocks"""
+
+    def test_get_message_slice_from_container(self):
+        """Test get_message_slice_from_container function"""
+
+        for message in TEST_MESSAGES:
+            container = get_huffman_code_container(message, 4)
+
+            with self.subTest(f'Message: {message}'):
+                self.assertEqual(
+                    get_message_from_container(container), message
+                )
+
+            for start, stop in (
+                    (0, 1), (3, 9), (5, 5), (7, 100), (-5, None), (-9, -2),
+                    (2, -3), (-100, 3), (6, 2)):
+                with self.subTest(
+                        f'Message: {message} *** Slice: {start}:{stop}'):
+                    self.assertEqual(
+                        get_message_slice_from_container(
+                            container, start, stop
+                        ),
+                        message[start:stop]
+                    )
+
+    def test_get_message_from_container_with_wrong_crc(self):
+        """Test get_message_from_container function for damaged block"""
+
+        container = bytearray(get_huffman_code_container(TEST_MESSAGES[2], 8))
+        _, _, block_index = read_huffman_code_container(container)
+        first_block_offset = block_index[0][0]
+        container[first_block_offset] ^= 1
+
+        with self.assertRaises(ValueError):
+            get_message_from_container(bytes(container))
+
+
+class TestHuffmanFile(TestCase):
+    """Class with tests for Huffman code for files"""
+
+    def test_decompress_file(self):
+        """Test decompress_file function"""
+
+        for message in TEST_MESSAGES + TEST_LONG_MESSAGES[2:3]:
+            with self.subTest(f'Message: {message[:60]}'), \
+                    TemporaryDirectory() as directory:
+                input_path = join(directory, 'input')
+                compressed_path = join(directory, 'compressed')
+                output_path = join(directory, 'output')
+
+                with open(input_path, 'wb') as input_file:
+                    input_file.write(message.encode())
+
+                compress_file(input_path, compressed_path, chunk_size=7)
+                decompress_file(compressed_path, output_path, chunk_size=5)
+
+                with open(output_path, 'rb') as output_file:
+                    self.assertEqual(output_file.read(), message.encode())
+
+
+class TestStaticHuffmanModel(TestCase):
+    """Class with tests for static Huffman models"""
+
+    def test_decode(self):
+        """Test decode method for symbols in model and escaped symbols"""
+
+        static_model = StaticHuffmanModel.from_samples(TEST_MESSAGES[:3])
+
+        for message in TEST_MESSAGES + ('Ω unseen symbols Ω', ):
+            with self.subTest(f'Message: {message}'):
+                self.assertEqual(
+                    static_model.decode(static_model.encode(message)),
+                    message
+                )
+
+        bytes_model = StaticHuffmanModel.from_samples((b'abcabd', ), False)
+
+        self.assertEqual(
+            bytes_model.decode(bytes_model.encode(b'abz\x00d')), b'abz\x00d'
+        )
+
+    def test_load(self):
+        """Test load method for model from save method"""
+
+        static_model = StaticHuffmanModel.from_samples(TEST_MESSAGES)
+
+        with TemporaryDirectory() as directory:
+            model_path = join(directory, 'model')
+            static_model.save(model_path)
+            loaded_model = StaticHuffmanModel.load(model_path)
+
+        self.assertEqual(
+            loaded_model.symbols_with_code_length,
+            static_model.symbols_with_code_length
+        )
+        self.assertEqual(
+            loaded_model.decode(static_model.encode(TEST_MESSAGES[1])),
+            TEST_MESSAGES[1]
+        )
+
+
+class TestNgramHuffmanCode(TestCase):
+    """Class with tests for Huffman code for n-grams"""
+
+    def test_get_ngram_symbols(self):
+        """Test get_ngram_symbols function"""
+
+        message = 'abababcab'
+        ngram_alphabet = get_ngram_alphabet(message, 2, 5)
+
+        self.assertEqual(ngram_alphabet, {'ab'})
+        self.assertEqual(
+            get_ngram_symbols(message, 2, ngram_alphabet),
+            ['ab', 'ab', 'ab', 'c', 'a', 'b']
+        )
+        self.assertEqual(get_ngram_alphabet(message, 2, 3), set())
+
+    def test_get_message_from_ngram_huffman_code(self):
+        """Test get_message_from_ngram_huffman_code function"""
+
+        for message in TEST_MESSAGES + TEST_LONG_MESSAGES[:1]:
+            for ngram_length in (1, 2, 3):
+                with self.subTest(
+                        f'Message: {message[:60]}, n-gram: {ngram_length}'):
+                    code = get_ngram_huffman_code(message, ngram_length)
+
+                    self.assertEqual(
+                        get_message_from_ngram_huffman_code(*code), message
+                    )
+
+        message = b'\x00\x00\x00\x01' * 100
+        code = get_ngram_huffman_code(message)
+
+        self.assertEqual(
+            get_message_from_ngram_huffman_code(*code, False), message
+        )
+        self.assertLess(code[2], len(message))
+
+    def test_get_average_length_of_ngram_code_message(self):
+        """Test average length of n-gram code in bits per message symbol"""
+
+        for message in TEST_MESSAGES + TEST_LONG_MESSAGES[:1]:
+            if not message:
+                continue
+
+            for ngram_length in (1, 2, 3):
+                with self.subTest(
+                        f'Message: {message[:60]}, n-gram: {ngram_length}'):
+                    symbols_with_code, _, bit_length = get_ngram_huffman_code(
+                        message, ngram_length
+                    )
+                    ngram_symbols_with_frequency = get_symbols_with_frequency(
+                        get_ngram_symbols(
+                            message, ngram_length,
+                            get_ngram_alphabet(message, ngram_length)
+                        )
+                    )
+
+                    # Probabilities of symbols are rounded to 5 digits
+                    self.assertAlmostEqual(
+                        get_average_length_of_code_message(
+                            symbols_with_code, ngram_symbols_with_frequency,
+                            len(message)
+                        ),
+                        bit_length / len(message),
+                        3
+                    )
+
+
+class TestInterleavedHuffmanCode(TestCase):
+    """Class with tests for Huffman code with interleaved streams"""
+
+    def test_get_message_from_interleaved_huffman_code(self):
+        """Test get_message_from_interleaved_huffman_code function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            # Fixture has no code for the empty message
+            if TEST_SYMBOLS_WITH_CODE[i] is None:
+                continue
+
+            message = TEST_MESSAGES[i]
+            decoding_tables = get_decoding_tables(TEST_SYMBOLS_WITH_CODE[i])
+
+            for streams_amount in (1, 2, 4, 7):
+                with self.subTest(
+                        f'Message: {message}, streams: {streams_amount}'):
+                    interleaved_code = get_interleaved_huffman_code(
+                        TEST_SYMBOLS_WITH_CODE[i], message, streams_amount
+                    )
+
+                    self.assertEqual(
+                        get_message_from_interleaved_huffman_code(
+                            decoding_tables, interleaved_code
+                        ),
+                        message
+                    )
+
+        for streams_amount in (1, 4):
+            with self.subTest(f'Empty message, streams: {streams_amount}'):
+                self.assertEqual(
+                    get_message_from_interleaved_huffman_code(
+                        get_decoding_tables({}),
+                        get_interleaved_huffman_code({}, '', streams_amount)
+                    ),
+                    ''
+                )
+
+        message = TEST_LONG_MESSAGES[2].encode()
+        symbols_with_code = get_canonical_symbols_with_code(
+            get_symbols_with_code_length_by_frequency(
+                get_symbols_with_frequency(message)
+            )
+        )
+
+        self.assertEqual(
+            get_message_from_interleaved_huffman_code(
+                get_decoding_tables(symbols_with_code),
+                get_interleaved_huffman_code(symbols_with_code, message),
+                False, 2
+            ),
+            message
+        )
+
+
+class TestBenchmark(TestCase):
+    """Class with tests for benchmark of Huffman code"""
+
+    def test_get_corpus(self):
+        """Test get_corpus function"""
+
+        for corpus_name in CORPUS_GENERATORS:
+            with self.subTest(f'Corpus: {corpus_name}'):
+                corpus = get_corpus(corpus_name, 1000)
+
+                self.assertEqual(len(corpus), 1000)
+                self.assertEqual(corpus, get_corpus(corpus_name, 1000))
+                self.assertEqual(
+                    set(get_stage_times(corpus, 1)),
+                    {'frequency', 'tree', 'code', 'encode', 'decode'}
+                )
+
+    def test_get_regressions(self):
+        """Test get_regressions function"""
+
+        baseline_results = {
+            'uniform/1024': {'tree': 0.01, 'encode': 0.02, 'decode': 1e-6},
+        }
+        results = {
+            'uniform/1024': {'tree': 0.011, 'encode': 0.05, 'decode': 1.0},
+            'english/1024': {'tree': 1.0},
+        }
+
+        self.assertEqual(
+            get_regressions(results, baseline_results, 1.5),
+            [('uniform/1024', 'encode', 0.02, 0.05)]
+        )
+
+
+def get_written_by_stream_writer(coroutine_function, data, *arguments):
+    """Get bytes written to mocked StreamWriter by coroutine function"""
+
+    async def write_to_stream_writer():
+        reader = StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        writer = Mock(drain=AsyncMock())
+
+        await coroutine_function(reader, writer, *arguments)
+
+        return b''.join(
+            written_call.args[0] for written_call in writer.write.mock_calls
+        )
+
+    return run(write_to_stream_writer())
+
+
+class TestHuffmanAsync(TestCase):
+    """Class with tests for Huffman code for asyncio streams"""
+
+    def test_write_message_from_huffman_code_frames(self):
+        """Test write_message_from_huffman_code_frames function"""
+
+        for message in TEST_MESSAGES + TEST_LONG_MESSAGES[2:3]:
+            for chunk_size in TEST_CHUNK_SIZES + (1 << 12, ):
+                if len(message) > chunk_size * 100:
+                    continue
+
+                with self.subTest(
+                        f'Message: {message[:60]}, chunk size: {chunk_size}'):
+                    huffman_code_frames = get_written_by_stream_writer(
+                        write_huffman_code_frames, message.encode(),
+                        chunk_size
+                    )
+
+                    self.assertEqual(
+                        get_written_by_stream_writer(
+                            write_message_from_huffman_code_frames,
+                            huffman_code_frames
+                        ),
+                        message.encode()
+                    )
+
+    def test_write_message_from_incomplete_huffman_code_frames(self):
+        """Test write_message_from_huffman_code_frames for cut stream"""
+
+        huffman_code_frames = get_written_by_stream_writer(
+            write_huffman_code_frames, TEST_MESSAGES[1].encode()
+        )
+
+        with self.assertRaises(ValueError):
+            get_written_by_stream_writer(
+                write_message_from_huffman_code_frames,
+                huffman_code_frames[:-3]
+            )
+
+
+class TestTokenHuffmanCode(TestCase):
+    """Class with tests for Huffman code for integer tokens"""
+
+    def test_get_token_code_values(self):
+        """Test get_token_code_values function"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            tokens = array('I', list(TEST_MESSAGES[i].encode()))
+
+            with self.subTest(f'Tokens: {tokens}'):
+                token_code_lengths = get_token_code_lengths(
+                    get_token_frequencies(tokens)
+                )
+                token_code_values = get_token_code_values(token_code_lengths)
+                symbols_with_frequency = get_symbols_with_frequency(tokens)
+                symbols_with_code_length = \
+                    get_symbols_with_code_length_by_frequency(
+                        symbols_with_frequency
+                    )
+
+                # Ties of frequencies can give other but as short code
+                self.assertEqual(
+                    sum(
+                        frequency * token_code_lengths[token]
+                        for token, frequency in symbols_with_frequency.items()
+                    ),
+                    sum(
+                        frequency * symbols_with_code_length[token]
+                        for token, frequency in symbols_with_frequency.items()
+                    )
+                )
+                self.assertEqual(
+                    {
+                        token: format(token_code_values[token], f'0{length}b')
+                        for token, length in enumerate(token_code_lengths)
+                        if length != 0
+                    },
+                    get_canonical_symbols_with_code({
+                        token: length
+                        for token, length in enumerate(token_code_lengths)
+                        if length != 0
+                    })
+                )
+
+    def test_get_tokens_from_token_huffman_code(self):
+        """Test get_tokens_from_token_huffman_code function"""
+
+        test_tokens = (
+            array('I'), array('I', [7]), array('I', [1 << 17, 0, 5] * 3),
+            array('I', (randint(0, 1 << 17) for _ in range(5000))),
+            [randint(0, 300) ** 2 % 1000 for _ in range(10000)]
+        )
+
+        for tokens in test_tokens:
+            with self.subTest(f'Tokens: {tokens[:20]}'):
+                self.assertEqual(
+                    get_tokens_from_token_huffman_code(
+                        get_token_huffman_code(tokens)
+                    ).tolist(),
+                    list(tokens)
+                )
+
+
+class TestArrayHuffmanCodeTree(TestCase):
+    """Class with tests for Huffman code tree in arrays"""
+
+    def test_get_code_table(self):
+        """Test get_code_table method"""
+
+        for i in range(TEST_MESSAGES_AMOUNT):
+            frequency = TEST_FREQUENCIES[i]
+
+            with self.subTest(f'Frequency: {frequency}'):
+                symbols, _, code_lengths = ArrayHuffmanCodeTree(
+                    frequency
+                ).get_code_table()
+
+                self.assertEqual(
+                    dict(zip(symbols, code_lengths)),
+                    get_symbols_with_code_length_by_frequency(frequency)
+                )
+
+    def test_get_code_table_for_frequencies_with_ties(self):
+        """Test get_code_table method for symbols with the same frequency"""
+
+        for frequency in TEST_FREQUENCIES_WITH_TIES + tuple(
+                dict(enumerate(randint(1, 5) for _ in range(randint(2, 30))))
+                for _ in range(100)):
+            with self.subTest(f'Frequency: {frequency}'):
+                symbols, _, code_lengths = ArrayHuffmanCodeTree(
+                    frequency
+                ).get_code_table()
+
+                self.assertEqual(
+                    dict(zip(symbols, code_lengths)),
+                    get_symbols_with_code_length_by_frequency(frequency)
+                )
+
+    def test_get_symbols_from_packed_code(self):
+        """Test get_symbols_from_packed_code method"""
+
+        for message in TEST_MESSAGES + (((1, 2), (1, 2), 3), ):
+            with self.subTest(f'Message: {message}'):
+                code_tree = ArrayHuffmanCodeTree(
+                    get_symbols_with_frequency(message)
+                )
+                packed_code, bit_length = get_packed_huffman_code(
+                    get_symbols_with_code_from_code_table(
+                        code_tree.get_code_table()
+                    ),
+                    message
+                )
+
+                self.assertEqual(
+                    code_tree.get_symbols_from_packed_code(
+                        packed_code, bit_length
+                    ),
+                    list(message)
+                )
+
+
+class TestCrcCode(TestCase):
+    """Class with tests for CRC code"""
+
+    def test_get_crc_code(self):
+        """Test get_crc_code function"""
+
+        binary_code_for_polynomial = get_binary_code_for_polynomial(POLYNOMIAL)
+
+        for binary_message, expected_crc_code in \
+                TEST_CRC_BINARY_MESSAGES_AND_EXPECTED_CRC_CODES:
+            with self.subTest(f'Binary message: {binary_message}'):
+                self.assertEqual(
+                    get_crc_code(binary_message, binary_code_for_polynomial),
+                    expected_crc_code
+                )
+
+    def test_get_crc_for_binary_message(self):
+        """Test get_crc_for_binary_message function"""
+
+        for polynomial in TEST_CRC_POLYNOMIALS:
+            binary_code_for_polynomial = get_binary_code_for_polynomial(
+                polynomial
+            )
+            degree_of_polynomial = len(binary_code_for_polynomial) - 1
+
+            for binary_message in ('1', '1011', '101001000110011110001111',
+                                   '10100100011001111000111111100001101'):
+                with self.subTest(
+                        f'Polynomial: {polynomial}, '
+                        f'message: {binary_message}'):
+                    crc = get_crc_for_binary_message(
+                        binary_message, binary_code_for_polynomial
+                    )
+
+                    # Message with CRC instead of zero bits has CRC 0
+                    self.assertLess(crc, 1 << degree_of_polynomial)
+                    self.assertEqual(
+                        get_crc_for_binary_message(
+                            binary_message +
+                            format(crc, f'0{degree_of_polynomial}b'),
+                            binary_code_for_polynomial
+                        ),
+                        0
+                    )
+
+        self.assertEqual(
+            get_crc_for_binary_message(
+                TEST_CRC_BINARY_MESSAGES_AND_EXPECTED_CRC_CODES[0][0][:-10],
+                get_binary_code_for_polynomial(POLYNOMIAL)
+            ),
+            int(TEST_CRC_BINARY_MESSAGES_AND_EXPECTED_CRC_CODES[0][1], 2)
+        )
+
+    def test_get_crc_for_bytes(self):
+        """Test get_crc_for_bytes function"""
+
+        binary_code_for_polynomial = get_binary_code_for_polynomial(POLYNOMIAL)
+        data = bytes(range(0, 256, 7))
+
+        for bytes_amount in (0, 1, 5, len(data)):
+            with self.subTest(f'Bytes amount: {bytes_amount}'):
+                self.assertEqual(
+                    get_crc_for_bytes(
+                        data, binary_code_for_polynomial, bytes_amount * 8
+                    ),
+                    get_crc_for_bytes(
+                        data[:bytes_amount], binary_code_for_polynomial
+                    )
+                )
+
+        self.assertEqual(
+            get_crc_for_bytes(bytes.fromhex('A4678FE1'),
+                              binary_code_for_polynomial),
+            int(TEST_CRC_BINARY_MESSAGES_AND_EXPECTED_CRC_CODES[0][1], 2)
+        )
+
+    def test_get_crc_for_bytes_by_slicing(self):
+        """Test get_crc_for_bytes_by_slicing function"""
+
+        data = bytes(range(3, 256, 5)) * 4
+
+        for polynomial in TEST_CRC_POLYNOMIALS + TEST_CRC_LONG_POLYNOMIALS:
+            binary_code_for_polynomial = get_binary_code_for_polynomial(
+                polynomial
+            )
+
+            for slices_amount in (8, 16):
+                for bit_length in (0, 7, 64, 71, 128, 133, len(data) * 8):
+                    with self.subTest(
+                            f'Polynomial: {polynomial}, '
+                            f'slices amount: {slices_amount}, '
+                            f'bit length: {bit_length}'):
+                        self.assertEqual(
+                            get_crc_for_bytes_by_slicing(
+                                data, binary_code_for_polynomial, bit_length,
+                                slices_amount
+                            ),
+                            get_crc_for_bytes(
+                                data, binary_code_for_polynomial, bit_length
+                            )
+                        )
+
+    def test_write_crc_tables_module(self):
+        """Test write_crc_tables_module function"""
+
+        with TemporaryDirectory() as directory:
+            module_path = join(directory, 'crc_tables.py')
+            write_crc_tables_module(module_path, TEST_CRC_POLYNOMIALS)
+            module_globals = {}
+
+            with open(module_path) as module_file:
+                exec(module_file.read(), module_globals)
+
+        self.assertEqual(
+            module_globals['CRC_TABLES'],
+            {
+                binary_code_for_polynomial: CRC_TABLES[
+                    binary_code_for_polynomial
+                ]
+                for binary_code_for_polynomial in map(
+                    get_binary_code_for_polynomial, TEST_CRC_POLYNOMIALS
+                )
+            }
+        )
+        self.assertEqual(
+            len(get_crc_table(get_binary_code_for_polynomial(POLYNOMIAL))),
+            256
+        )